@@ -13,6 +13,7 @@ import random
 import pylink
 import pygame
 from pygame.locals import *
+from eyelink_coregraphics import EyeLinkCoreGraphicsPygame
 
 # Screen resolution
 SCN_W, SCN_H = (1280, 800)
@@ -46,11 +47,13 @@ tk.sendMessage(f'DISPLAY_COORDS 0 0 {SCN_W - 1} {SCN_H - 1}')
 # Set the calibration type to 9-point (HV9)
 tk.sendCommand("calibration_type = HV9")
 
-# Step 4: open a Pygame window; then, call pylink.openGraphics()
-# to request Pylink to use this window for calibration
-pygame.display.set_mode((SCN_W, SCN_H), DOUBLEBUF | FULLSCREEN)
+# Step 4: open a Pygame window; then, call pylink.openGraphicsEx()
+# to request Pylink to use this window for calibration, with the custom
+# calibration display (see eyelink_coregraphics)
+win = pygame.display.set_mode((SCN_W, SCN_H), DOUBLEBUF | FULLSCREEN)
 pygame.mouse.set_visible(False)  # hide the mouse cursor
-pylink.openGraphics()
+genv = EyeLinkCoreGraphicsPygame(tk, win)
+pylink.openGraphicsEx(genv)
 
 # Step 5: calibrate the tracker, then run through the trials
 tk.doTrackerSetup()
@@ -11,7 +11,7 @@ import pylink
 import os
 import random
 from psychopy import visual, core, event, monitors
-from EyeLinkCoreGraphicsPsychoPy import EyeLinkCoreGraphicsPsychoPy
+from eyelink_coregraphics import EyeLinkCoreGraphicsPsychoPy
 from math import sin, pi
 
 # Monitor resolution
@@ -9,7 +9,7 @@
 
 import pylink
 from psychopy import visual, core, event, monitors
-from EyeLinkCoreGraphicsPsychoPy import EyeLinkCoreGraphicsPsychoPy
+from eyelink_coregraphics import EyeLinkCoreGraphicsPsychoPy
 
 # Connect to the tracker
 tk = pylink.EyeLink('100.1.1.1')
@@ -9,7 +9,7 @@
 
 import pylink
 from psychopy import visual, core, event, monitors
-from EyeLinkCoreGraphicsPsychoPy import EyeLinkCoreGraphicsPsychoPy
+from eyelink_coregraphics import EyeLinkCoreGraphicsPsychoPy
 from math import hypot
 
 # Connect to the tracker
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+#
+# Filename: async_link.py
+# Author: Zhiguo Wang
+# Date: 10/18/2026
+#
+# Description:
+# An asyncio interface to the tracker connection. Pylink calls block, and
+# the connection should be used from one thread only, so all the calls
+# run on a dedicated executor thread; the event loop is free to prepare
+# stimuli, write logs, etc., in the meantime. A background task drains
+# the link (see link_reader.py) and hands the samples and events over to
+# any number of consumers, each with a bounded queue of its own, e.g.,
+#
+#     async with AsyncLink(tk) as link:
+#         await link.message('TRIALID 1')
+#         async for smp in link.samples():
+#             print(smp['time'], smp['gx'], smp['gy'])
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from link_reader import LinkReader
+from event_pump import EVENT_NAMES, EyeEvent
+
+
+class Subscription:
+    '''An async iterator over the samples or events handed over to one
+    consumer; if the consumer falls behind and its queue is full, the
+    oldest block is dropped, so a slow consumer never holds up the link
+    or the other consumers; if the link fails, the error is raised in
+    the consumer'''
+
+    def __init__(self, subscribers, maxsize, blocks=False):
+        self._subscribers = subscribers
+        self._blocks = blocks
+        self._queue = asyncio.Queue(maxsize)
+        self._items = iter(())
+        # number of blocks dropped because the queue was full
+        self.dropped = 0
+        subscribers.append(self)
+
+    def put(self, block):
+        '''Queue a block of items (None marks the end of the stream, an
+        exception ends it with that error)'''
+
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(block)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        for item in self._items:
+            return item
+        while True:
+            block = await self._queue.get()
+            if block is None or isinstance(block, Exception):
+                # keep the end marker, for any later call
+                self._queue.put_nowait(block)
+                if block is None:
+                    raise StopAsyncIteration
+                raise block
+            if self._blocks:
+                return block
+            self._items = iter(block)
+            for item in self._items:
+                return item
+
+    def close(self):
+        '''Stop receiving data'''
+
+        if self in self._subscribers:
+            self._subscribers.remove(self)
+
+
+class AsyncLink:
+    '''Run the tracker calls on a dedicated thread, and stream the link
+    data to the consumers'''
+
+    def __init__(self, tracker, sample_rate=1000, eye=None):
+        '''Initialize
+
+        tracker: an EyeLink instance (connection)
+        sample_rate: sampling rate (in Hz), see LinkReader
+        eye: stream the events of this eye only, 0-left, 1-right; None for
+             both eyes'''
+
+        self._tk = tracker
+        self.eye = eye
+        self._executor = ThreadPoolExecutor(max_workers=1,
+                                            thread_name_prefix='eyelink')
+        self._reader = LinkReader(tracker, sample_rate,
+                                  on_event=self._collect)
+        self._events = []
+        self._sample_subs = []
+        self._event_subs = []
+        self._task = None
+        self._running = False
+
+    async def call(self, func, *args):
+        '''Run a tracker call, e.g., tk.startRecording, on the tracker
+        thread; return its result'''
+
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def message(self, text):
+        '''Send a message to the EDF data file'''
+
+        return await self.call(self._tk.sendMessage, text)
+
+    async def command(self, text):
+        '''Send a command to the tracker'''
+
+        return await self.call(self._tk.sendCommand, text)
+
+    def samples(self, maxsize=64, blocks=False):
+        '''Subscribe to the samples (records of SAMPLE_DTYPE, see
+        sample_record.py); maxsize is the queue size, in blocks
+
+        blocks: iterate over blocks of samples (structured arrays), e.g.,
+                for writing them to a file, rather than single samples'''
+
+        return Subscription(self._sample_subs, maxsize, blocks)
+
+    def events(self, maxsize=64, blocks=False):
+        '''Subscribe to the eye events (EyeEvent records, see
+        event_pump.py); maxsize is the queue size, in blocks
+
+        blocks: iterate over lists of events rather than single events'''
+
+        return Subscription(self._event_subs, maxsize, blocks)
+
+    def _collect(self, ev_type, ev):
+        '''Copy the eye events found by the LinkReader, on the tracker
+        thread'''
+
+        if ev_type in EVENT_NAMES and \
+           (self.eye is None or ev.getEye() == self.eye):
+            self._events.append(EyeEvent(ev_type, ev))
+
+    def _drain(self):
+        '''Drain the link, on the tracker thread
+
+        Return the new samples and events'''
+
+        self._events = []
+        self._reader.drain()
+
+        return self._reader.ring.read(), self._events
+
+    def _publish(self, samples, events):
+        '''Hand the new samples and events over to the consumers'''
+
+        if len(samples):
+            for sub in list(self._sample_subs):
+                sub.put(samples)
+        if events:
+            for sub in list(self._event_subs):
+                sub.put(events)
+
+    def _end(self, marker):
+        '''End the iteration of all the consumers, marker is None or the
+        error that stopped the streaming'''
+
+        for sub in self._sample_subs + self._event_subs:
+            sub.put(marker)
+
+    async def _pump(self):
+        '''Drain the link and hand the data over to the consumers, until
+        stop() is called; if a tracker call fails, the consumers get the
+        error right away'''
+
+        try:
+            while self._running:
+                self._publish(*await self.call(self._drain))
+                # the LinkReader adjusts the sleep time to the data rate
+                await asyncio.sleep(self._reader.sleep_time)
+        except Exception as e:
+            self._end(e)
+            raise
+
+    def start(self):
+        '''Start streaming the link data, e.g., after startRecording'''
+
+        if self._task is None:
+            self._running = True
+            self._task = asyncio.ensure_future(self._pump())
+
+    async def stop(self):
+        '''Stop streaming, and end the iteration of all the consumers; the
+        data still queued on the link are drained and handed over first,
+        e.g., call it after stopRecording'''
+
+        if self._task is None:
+            return
+        self._running = False
+        task, self._task = self._task, None
+        marker = None
+        try:
+            await task
+            self._publish(*await self.call(self._drain))
+        except Exception as e:
+            # e.g., the link was lost
+            marker = e
+            raise
+        finally:
+            self._end(marker)
+
+    def report(self):
+        '''Summarize the data streamed, and the blocks the consumers
+        dropped'''
+
+        drops = [sub.dropped for sub in self._sample_subs + self._event_subs]
+
+        return (f'{self._reader.report()}; '
+                f'{sum(drops)} blocks dropped by slow consumers')
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        try:
+            await self.stop()
+        finally:
+            self._executor.shutdown()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+#
+# Filename: async_retrieval.py
+# Author: Zhiguo Wang
+# Date: 10/18/2026
+#
+# Description:
+# A short script illustrating online retrieval of sample and event data
+# with asyncio (see async_link.py). Three consumers share the link data:
+# a logger writing the samples to a file, a monitor checking the data
+# quality, and a task sending a message for each saccade.
+
+import asyncio
+import pylink
+from async_link import AsyncLink
+from sample_writer import SampleWriter
+
+# Connect to the tracker
+tk = pylink.EyeLink('100.1.1.1')
+
+# Open an EDF data file on the Host PC
+tk.openDataFile('async.edf')
+
+# Put the tracker in offline mode before we change tracking parameters
+tk.setOfflineMode()
+
+# Set sample rate to 1000 Hz
+tk.sendCommand('sample_rate 1000')
+
+# Make gaze, HREF, and raw (PUPIL) data, and the eye events available
+# over the link
+sample_flag = 'LEFT,RIGHT,GAZE,GAZERES,PUPIL,HREF,AREA,STATUS,INPUT'
+tk.sendCommand(f'link_sample_data = {sample_flag}')
+event_flgs = 'LEFT,RIGHT,FIXATION,FIXUPDATE,SACCADE,BLINK,BUTTON,INPUT'
+tk.sendCommand(f'link_event_filter = {event_flgs}')
+
+# Open an SDL window for calibration
+pylink.openGraphics()
+
+# Set up the camera and calibrate the tracker
+tk.doTrackerSetup()
+
+# Put tracker in idle/offline mode before we start recording
+tk.setOfflineMode()
+
+
+async def log_samples(blocks, writer):
+    '''Write the blocks of samples to a file, see sample_writer.py'''
+
+    async for block in blocks:
+        writer.put(block)
+
+
+async def monitor_quality(samples):
+    '''Count the samples with missing gaze data, e.g., during blinks'''
+
+    n = missing = 0
+    async for smp in samples:
+        n += 1
+        if smp['gx'] == pylink.MISSING_DATA:
+            missing += 1
+    print(f'{missing} of {n} samples without gaze data')
+
+
+async def mark_saccades(link, events):
+    '''Send a message for each saccade, to examine the link delay'''
+
+    async for ev in events:
+        if ev.type == pylink.ENDSACC:
+            await link.message(f'ENDSACC {ev.time} amp {ev.amplitude:.2f}')
+
+
+async def main():
+    writer = SampleWriter('async_data.smp', flags=sample_flag,
+                          sample_rate=1000)
+    link = AsyncLink(tk)
+
+    # Subscribe the consumers before the data start to flow, each
+    # consumer gets all the samples or events
+    consumers = [
+        asyncio.ensure_future(
+            log_samples(link.samples(blocks=True), writer)),
+        asyncio.ensure_future(monitor_quality(link.samples())),
+        asyncio.ensure_future(mark_saccades(link, link.events()))]
+
+    # Start recording, on the tracker thread
+    await link.call(tk.startRecording, 1, 1, 1, 1)
+
+    async with link:
+        # Record for 5 seconds; the event loop is free to do other work
+        # in the meantime, e.g., prepare the stimuli of the next trial
+        await asyncio.sleep(5.0)
+
+        # Stop recording, then stop streaming; the samples and events
+        # still queued on the link are handed over before the consumers
+        # finish
+        await link.call(tk.stopRecording)
+        await link.stop()
+        await asyncio.gather(*consumers)
+
+    # Write the remaining samples and close the sample file
+    writer.close()
+    print(link.report())
+    print(writer.report())
+
+
+asyncio.run(main())
+
+# Close the EDF data file on the Host
+tk.closeDataFile()
+
+# Download the EDF data file from Host
+tk.receiveDataFile('async.edf', 'async.edf')
+
+# Close the link to the tracker
+tk.close()
+
+# Close the window
+pylink.closeGraphics()
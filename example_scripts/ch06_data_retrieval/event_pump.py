@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+#
+# Filename: event_pump.py
+# Author: Zhiguo Wang
+# Date: 10/18/2026
+#
+# Description:
+# Dispatch the eye events retrieved over the link to handler functions.
+# A dict maps the event types (pylink.STARTSACC, pylink.ENDFIX, etc.) to
+# the handlers, so each event takes a single lookup; an event is read
+# with getFloatData() only if it has a handler, and its data is copied
+# once into a compact EyeEvent record with the getters that apply to its
+# type. The pump counts the events of each type and keeps a histogram of
+# the time each handler takes.
+
+import time
+import bisect
+import pylink
+
+# The event types and their names
+EVENT_NAMES = {pylink.STARTSACC: 'STARTSACC', pylink.ENDSACC: 'ENDSACC',
+               pylink.STARTFIX: 'STARTFIX', pylink.ENDFIX: 'ENDFIX',
+               pylink.FIXUPDATE: 'FIXUPDATE',
+               pylink.STARTBLINK: 'STARTBLINK',
+               pylink.ENDBLINK: 'ENDBLINK'}
+
+# Upper edges of the handler latency bins, in microseconds
+LATENCY_BINS = [10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000]
+
+
+class EyeEvent:
+    '''An eye event; the fields that do not apply to the event type
+    (e.g., amplitude for a fixation) are None'''
+
+    __slots__ = ('type', 'eye', 'time', 'start_time', 'end_time',
+                 'start_gaze', 'end_gaze', 'avg_gaze', 'avg_pupil',
+                 'amplitude', 'angle', 'avg_velocity', 'peak_velocity',
+                 'start_href', 'end_href', 'start_ppd', 'end_ppd',
+                 'start_velocity', 'end_velocity')
+
+    def __init__(self, ev_type, ev):
+        '''Copy the data of a pylink event (from getFloatData())'''
+
+        self.type = ev_type
+        self.eye = ev.getEye()
+        self.time = ev.getTime()
+        self.start_time = ev.getStartTime()
+        self.end_time = None
+        self.start_gaze = None
+        self.end_gaze = None
+        self.avg_gaze = None
+        self.avg_pupil = None
+        self.amplitude = None
+        self.angle = None
+        self.avg_velocity = None
+        self.peak_velocity = None
+        self.start_href = None
+        self.end_href = None
+        self.start_ppd = None
+        self.end_ppd = None
+        self.start_velocity = None
+        self.end_velocity = None
+
+        if ev_type in (pylink.STARTSACC, pylink.STARTFIX):
+            self.start_gaze = ev.getStartGaze()
+        elif ev_type == pylink.ENDSACC:
+            self.end_time = ev.getEndTime()
+            self.start_gaze = ev.getStartGaze()
+            self.end_gaze = ev.getEndGaze()
+            self.amplitude = ev.getAmplitude()
+            self.angle = ev.getAngle()
+            self.avg_velocity = ev.getAverageVelocity()
+            self.peak_velocity = ev.getPeakVelocity()
+            self.start_href = ev.getStartHREF()
+            self.end_href = ev.getEndHREF()
+            self.start_ppd = ev.getStartPPD()
+            self.end_ppd = ev.getEndPPD()
+            self.start_velocity = ev.getStartVelocity()
+            self.end_velocity = ev.getEndVelocity()
+        elif ev_type in (pylink.ENDFIX, pylink.FIXUPDATE):
+            self.end_time = ev.getEndTime()
+            self.start_gaze = ev.getStartGaze()
+            self.end_gaze = ev.getEndGaze()
+            self.avg_gaze = ev.getAverageGaze()
+            self.avg_pupil = ev.getAveragePupilSize()
+        elif ev_type == pylink.ENDBLINK:
+            self.end_time = ev.getEndTime()
+
+    @property
+    def name(self):
+        return EVENT_NAMES.get(self.type, str(self.type))
+
+    def __repr__(self):
+        fields = ', '.join(f'{key}={getattr(self, key)!r}'
+                           for key in self.__slots__[1:]
+                           if getattr(self, key) is not None)
+
+        return f'EyeEvent({self.name}, {fields})'
+
+
+class EventPump:
+    '''Read the link data, dispatch the eye events to their handlers'''
+
+    def __init__(self, tracker, eye=None):
+        '''Initialize
+
+        tracker: an EyeLink instance (connection)
+        eye: dispatch the events of this eye only, 0-left, 1-right;
+             None for both eyes'''
+
+        self._tk = tracker
+        self.eye = eye
+        self._handlers = {}
+
+        # number of events of each type (dispatched or not), and the
+        # histogram of the handler latencies of each type
+        self.counts = dict.fromkeys(EVENT_NAMES, 0)
+        self.latency = {}
+
+    def on(self, ev_type, handler):
+        '''Call handler(event) for the events of a type, an EyeEvent
+        record is passed to the handler'''
+
+        self._handlers[ev_type] = handler
+        self.latency[ev_type] = [0] * (len(LATENCY_BINS) + 1)
+
+    def dispatch(self, ev_type, ev=None):
+        '''Dispatch an item from the link queue, "ev" is the data from
+        getFloatData(), which is read here if not given
+
+        This function can also be passed as "on_event" to a LinkReader
+        (see link_reader.py), to read samples and events in one loop'''
+
+        if ev_type in self.counts:
+            self.counts[ev_type] += 1
+        handler = self._handlers.get(ev_type)
+        if handler is None:
+            return
+
+        if ev is None:
+            ev = self._tk.getFloatData()
+        if self.eye is not None and ev.getEye() != self.eye:
+            return
+
+        t0 = time.perf_counter()
+        handler(EyeEvent(ev_type, ev))
+        t_us = (time.perf_counter() - t0)*1e6
+        self.latency[ev_type][bisect.bisect_right(LATENCY_BINS, t_us)] += 1
+
+    def pump(self):
+        '''Dispatch all the data queued on the link
+
+        Return the number of items read from the queue'''
+
+        n = 0
+        dt = self._tk.getNextData()
+        while dt:
+            self.dispatch(dt)
+            n += 1
+            dt = self._tk.getNextData()
+
+        return n
+
+    def report(self):
+        '''Summarize the events and the handler latencies, e.g., print it
+        after recording'''
+
+        lines = [', '.join(f'{EVENT_NAMES[ev_type]} {n}'
+                           for ev_type, n in self.counts.items())]
+        labels = [f'<{b}us' for b in LATENCY_BINS] + \
+                 [f'>={LATENCY_BINS[-1]}us']
+        for ev_type, hist in self.latency.items():
+            bins = ', '.join(f'{label} {n}'
+                             for label, n in zip(labels, hist) if n)
+            lines.append(f'{EVENT_NAMES.get(ev_type, ev_type)} handler: '
+                         f'{bins or "not called"}')
+
+        return '\n'.join(lines)
@@ -8,6 +8,7 @@
 # A short script illustrating online retrieval of eye events
 
 import pylink
+from event_pump import EventPump
 
 # Connect to the tracker
 tk = pylink.EyeLink('100.1.1.1')
@@ -49,6 +50,21 @@ eye_to_read = tk.eyeAvailable()
 if eye_to_read == 2:
     eye_to_read = 1
 
+# Dispatch the events of the eye to read to handler functions, see
+# event_pump.py
+pump = EventPump(tk, eye=eye_to_read)
+
+
+# Send a message to the tracker when an event is received over the link;
+# include the timestamp in the message to examine the link delay
+def log_event(ev):
+    tk.sendMessage(f'{ev.name} {ev.time}')
+
+
+for ev_type in [pylink.STARTSACC, pylink.ENDSACC,
+                pylink.STARTFIX, pylink.ENDFIX]:
+    pump.on(ev_type, log_event)
+
 # Get the current tracker time
 t_start = tk.trackerTime()
 while True:
@@ -56,28 +72,15 @@ while True:
     if tk.trackerTime() - t_start > 5000:
         break
 
-    # Retrieve the oldest event in the buffer
-    dt = tk.getNextData()
-    if dt in [pylink.STARTSACC, pylink.ENDSACC,
-              pylink.STARTFIX, pylink.ENDFIX]:
-        ev = tk.getFloatData()
-        # Look for right eye events only; 0-left, 1-right
-        if ev.getEye() == eye_to_read:
-            # Send a message to the tracker when an event is
-            # received over the link; include the timestamp
-            # in the message to examine the link delay
-            if dt == pylink.STARTSACC:
-                tk.sendMessage(f'STARTSACC {ev.getTime()}')
-            if dt == pylink.ENDSACC:
-                tk.sendMessage(f'ENDSACC {ev.getTime()}')
-            if dt == pylink.STARTFIX:
-                tk.sendMessage(f'STARTFIX {ev.getTime()}')
-            if dt == pylink.ENDFIX:
-                tk.sendMessage(f'ENDFIX {ev.getTime()}')
+    # Dispatch the events in the buffer, oldest first
+    pump.pump()
 
 # Stop recording
 tk.stopRecording()
 
+# Print the number of events and the handler latencies
+print(pump.report())
+
 # Close the EDF data file on the Host
 tk.closeDataFile()
 
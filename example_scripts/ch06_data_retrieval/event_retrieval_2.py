@@ -8,6 +8,7 @@
 # A short script illustrating online retrieval of eye events
 
 import pylink
+from event_pump import EventPump
 
 # Connect to the tracker
 tk = pylink.EyeLink('100.1.1.1')
@@ -49,6 +50,22 @@ eye_to_read = tk.eyeAvailable()
 if eye_to_read == 2:
     eye_to_read = 1
 
+# Print the ENDSACC events of the eye to read, see event_pump.py; the
+# event data are copied into a record with all the saccade properties
+# when the event is received
+pump = EventPump(tk, eye=eye_to_read)
+
+
+def print_saccade(ev):
+    '''Print the saccade properties, one per line'''
+
+    print('ENDSACC Event:')
+    for key in ev.__slots__:
+        print(f'  {key}: {getattr(ev, key)}')
+
+
+pump.on(pylink.ENDSACC, print_saccade)
+
 # Current tracker time
 t_start = tk.trackerTime()
 while True:
@@ -56,34 +73,15 @@ while True:
     if tk.trackerTime() - t_start > 5000:
         break
 
-    # Retrieve the oldest event in the buffer
-    dt = tk.getNextData()
-    if dt == pylink.ENDSACC:
-        ev = tk.getFloatData()
-        # Look for right eye events only; 0-left, 1-right
-        if ev.getEye() == eye_to_read:
-            print('ENDSACC Event: \n',
-                  'Amplitude', ev.getAmplitude(), '\n',
-                  'Angle', ev.getAngle(), '\n',
-                  'AverageVelocity', ev.getAverageVelocity(), '\n',
-                  'PeakVelocity', ev.getPeakVelocity(), '\n',
-                  'StartTime', ev.getStartTime(), '\n',
-                  'StartGaze', ev.getStartGaze(), '\n',
-                  'StartHREF', ev.getStartHREF(), '\n',
-                  'StartPPD', ev.getStartPPD(), '\n',
-                  'StartVelocity', ev.getStartVelocity(), '\n',
-                  'EndTime', ev.getEndTime(), '\n',
-                  'EndGaze', ev.getEndGaze(), '\n',
-                  'EndHREF', ev.getEndHREF(), '\n',
-                  'EndPPD', ev.getEndPPD(), '\n',
-                  'EndVelocity', ev.getEndVelocity(), '\n',
-                  'Eye', ev.getEye(), '\n',
-                  'Time', ev.getTime(), '\n',
-                  'Type', ev.getType(), '\n')
+    # Dispatch the events in the buffer, oldest first
+    pump.pump()
 
 # Stop recording
 tk.stopRecording()
 
+# Print the number of events and the handler latencies
+print(pump.report())
+
 # Close the EDF data file on the Host
 tk.closeDataFile()
 
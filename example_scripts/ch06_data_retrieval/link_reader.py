@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+#
+# Filename: link_reader.py
+# Author: Zhiguo Wang
+# Date: 10/18/2026
+#
+# Description:
+# Lossless retrieval of sample data over the link. getNewestSample() only
+# returns the latest sample, so samples are lost whenever the polling loop
+# is slower than the sampling rate. Here we read every queued sample with
+# getNextData() and getFloatData(), store the samples in a preallocated
+# NumPy ring buffer, and count the samples missing from the stream (e.g.,
+# when the link queue overflows) from the gaps between the timestamps.
+
+import time
+import numpy as np
+import pylink
+from sample_record import SAMPLE_DTYPE
+
+
+class SampleRing:
+    '''A ring buffer of samples, holding the latest "capacity" samples
+    (records of SAMPLE_DTYPE, see sample_record.py)'''
+
+    def __init__(self, capacity, dtype=SAMPLE_DTYPE):
+        self.data = np.zeros(capacity, dtype)
+        self.capacity = capacity
+        # number of samples appended, and read with read()
+        self.count = 0
+        self._read = 0
+        # number of samples overwritten before they were read
+        self.overruns = 0
+
+    def append(self, row):
+        '''Append a sample, a tuple of the fields'''
+
+        self.data[self.count % self.capacity] = row
+        self.count += 1
+
+    def _slice(self, start, stop):
+        '''A copy of the samples from start to stop (counts of samples
+        appended), in the order they were appended'''
+
+        idx = np.arange(start, stop) % self.capacity
+
+        return self.data[idx]
+
+    def latest(self, n):
+        '''A copy of the latest n samples'''
+
+        n = min(n, self.count, self.capacity)
+
+        return self._slice(self.count - n, self.count)
+
+    def read(self):
+        '''A copy of the samples appended since the last call'''
+
+        start = max(self._read, self.count - self.capacity)
+        self.overruns += start - self._read
+        self._read = self.count
+
+        return self._slice(start, self.count)
+
+
+class LinkReader:
+    '''Drain the samples queued on the link into a ring buffer'''
+
+    def __init__(self, tracker, sample_rate=1000, capacity=60000,
+                 min_sleep=0.0005, max_sleep=0.008, batch=4,
+                 on_event=None):
+        '''Initialize
+
+        tracker: an EyeLink instance (connection)
+        sample_rate: sampling rate (in Hz), for detecting missing samples
+        capacity: size of the ring buffer, in samples (60 s at 1000 Hz)
+        min_sleep, max_sleep: range of the sleep time (in seconds)
+                              between two drains, see wait()
+        batch: the number of samples expected per drain; the sleep time
+               is shortened if more samples are queued
+        on_event: a function called with (data type, data) for the
+                  other items (e.g., events) in the link queue, which are
+                  discarded by default'''
+
+        self._tk = tracker
+        self.ring = SampleRing(capacity)
+        self.interval = 1000.0/sample_rate
+        self.min_sleep = min_sleep
+        self.max_sleep = max_sleep
+        self.batch = batch
+        self.sleep_time = min_sleep
+        self._on_event = on_event
+
+        # timestamp of the last sample, and the number of samples missing
+        # from the stream, according to the gaps between the timestamps
+        self.last_time = None
+        self.dropped = 0
+
+        # number of drains, and the largest number of samples per drain
+        self.drains = 0
+        self.max_batch = 0
+
+    def _add(self, smp):
+        '''Store a sample, read data from the right eye if available'''
+
+        if smp.isRightSample():
+            eye, data = 1, smp.getRightEye()
+        elif smp.isLeftSample():
+            eye, data = 0, smp.getLeftEye()
+        else:
+            return
+
+        t = smp.getTime()
+        if self.last_time is not None:
+            if t <= self.last_time:
+                # not a new sample
+                return
+            gap = int(round((t - self.last_time)/self.interval)) - 1
+            if gap > 0:
+                self.dropped += gap
+        self.last_time = t
+
+        self.ring.append((t, eye) + data.getGaze() + data.getHREF() +
+                         data.getRawPupil() +
+                         (data.getPupilSize(), smp.getStatus()))
+
+    def drain(self):
+        '''Read all the data queued on the link, adjust the sleep time
+
+        Return the number of samples read'''
+
+        tk = self._tk
+        n = self.ring.count
+        dt = tk.getNextData()
+        while dt:
+            if dt == pylink.SAMPLE_TYPE:
+                self._add(tk.getFloatData())
+            elif self._on_event is not None:
+                self._on_event(dt, tk.getFloatData())
+            dt = tk.getNextData()
+        n = self.ring.count - n
+
+        # sleep longer if the queue was empty, shorter if more samples
+        # than expected were waiting
+        if n == 0:
+            self.sleep_time = min(self.sleep_time*2, self.max_sleep)
+        elif n > self.batch:
+            self.sleep_time = max(self.sleep_time/2, self.min_sleep)
+        self.drains += 1
+        self.max_batch = max(self.max_batch, n)
+
+        return n
+
+    def wait(self):
+        '''Sleep between two drains, instead of polling the link in a
+        busy loop'''
+
+        time.sleep(self.sleep_time)
+
+    def report(self):
+        '''Summarize the samples read, e.g., print it after recording'''
+
+        return (f'{self.ring.count} samples in {self.drains} drains '
+                f'(up to {self.max_batch} per drain), '
+                f'{self.dropped} dropped, '
+                f'{self.ring.overruns} overwritten in the ring buffer')
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+#
+# Filename: sample_record.py
+# Author: Zhiguo Wang
+# Date: 10/18/2026
+#
+# Description:
+# A compact binary format for the samples retrieved over the link. A file
+# starts with a fixed-size header, i.e., a magic string followed by a
+# JSON description (the "link_sample_data" flags, the sampling rate and
+# the record fields) padded to HEADER_SIZE bytes; then come the samples,
+# as fixed-width records of SAMPLE_DTYPE (39 bytes each). A reader maps
+# the records into a NumPy array with np.memmap, no parsing needed.
+#
+# Usage, to convert a sample file to CSV:
+#     python sample_record.py sample_data.smp sample_data.csv
+
+import sys
+import json
+import numpy as np
+
+# The fields of a sample record; eye: 0-left, 1-right; time in ms
+# (tracker time), gaze and HREF position, raw pupil position (camera
+# coordinates), pupil size, and the sample status (error flags)
+SAMPLE_DTYPE = np.dtype([('time', '<f8'), ('eye', 'i1'),
+                         ('gx', '<f4'), ('gy', '<f4'),
+                         ('hx', '<f4'), ('hy', '<f4'),
+                         ('rx', '<f4'), ('ry', '<f4'),
+                         ('pupil', '<f4'), ('status', '<u2')])
+
+MAGIC = b'EYESMP01'
+HEADER_SIZE = 512
+
+
+def write_header(f, flags='', sample_rate=0, dtype=SAMPLE_DTYPE):
+    '''Write the header to a file opened in binary mode
+
+    flags: the "link_sample_data" flags, e.g., 'LEFT,RIGHT,GAZE,HREF'
+    sample_rate: sampling rate, in Hz'''
+
+    desc = json.dumps({'flags': flags, 'sample_rate': sample_rate,
+                       'fields': dtype.descr}).encode()
+    if len(MAGIC) + len(desc) + 1 > HEADER_SIZE:
+        raise ValueError('Header too long')
+
+    f.write(MAGIC + desc.ljust(HEADER_SIZE - len(MAGIC) - 1) + b'\n')
+
+
+def read_header(path):
+    '''Read the header of a sample file
+
+    Return a dict of the flags, the sampling rate, and the record dtype'''
+
+    with open(path, 'rb') as f:
+        header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE or not header.startswith(MAGIC):
+        raise ValueError(f'Not a sample file: {path}')
+
+    info = json.loads(header[len(MAGIC):].decode())
+    info['dtype'] = np.dtype([tuple(field) for field in info.pop('fields')])
+
+    return info
+
+
+def open_records(path):
+    '''Map the samples of a file into a read-only structured array (no
+    copy is made, the file is read as the array is accessed)'''
+
+    dtype = read_header(path)['dtype']
+    with open(path, 'rb') as f:
+        f.seek(0, 2)
+        n = (f.tell() - HEADER_SIZE)//dtype.itemsize
+    if n == 0:
+        return np.empty(0, dtype)
+
+    return np.memmap(path, dtype, 'r', offset=HEADER_SIZE, shape=(n,))
+
+
+def write_csv(f, records, header=True):
+    '''Write records (a structured array) as CSV to a text file'''
+
+    if header:
+        f.write(','.join(records.dtype.names) + '\n')
+    fmt = ['%d' if records.dtype[name].kind in 'iu' else '%.2f'
+           for name in records.dtype.names]
+    np.savetxt(f, records, fmt=fmt, delimiter=',')
+
+
+def to_csv(path, csv_path, chunk_size=100000):
+    '''Convert a sample file to CSV, chunk by chunk'''
+
+    records = open_records(path)
+    with open(csv_path, 'w') as f:
+        for start in range(0, max(len(records), 1), chunk_size):
+            write_csv(f, records[start:start + chunk_size], start == 0)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) not in (2, 3):
+        sys.exit('Usage: python sample_record.py file.smp [file.csv]')
+    smp_path = sys.argv[1]
+    if len(sys.argv) == 3:
+        csv_path = sys.argv[2]
+    else:
+        csv_path = smp_path.rsplit('.', 1)[0] + '.csv'
+    to_csv(smp_path, csv_path)
@@ -8,6 +8,9 @@
 # A short script illustrating online retrieval of sample data
 
 import pylink
+from link_reader import LinkReader
+from sample_writer import SampleWriter
+from sample_record import to_csv
 
 # Connect to the tracker
 tk = pylink.EyeLink('100.1.1.1')
@@ -40,46 +43,48 @@ error = tk.startRecording(1, 1, 1, 1)
 # Wait for moment
 pylink.msecDelay(100)
 
-# Open a plain text file to store the retrieved sample data
-text_file = open('sample_data.csv', 'w')
+# Save the retrieved sample data to a binary file (see sample_record.py);
+# the file is written in a background thread (see sample_writer.py), so
+# writing never delays the retrieval of the samples
+writer = SampleWriter('sample_data.smp', flags=sample_flag,
+                      sample_rate=1000)
+
+# Read every sample queued on the link into a ring buffer, see
+# link_reader.py; getNewestSample() would miss the samples that arrive
+# while we are busy
+reader = LinkReader(tk, sample_rate=1000)
 
 # Current tracker time
-t_start = tk.trackerTime()  
-smp_time = -1
+t_start = tk.trackerTime()
 while True:
     # Break after 5 seconds have elapsed
     if tk.trackerTime() - t_start > 5000:
         break
 
-    # Poll the latest samples
-    smp = tk.getNewestSample()
-    if smp is not None:
-        # Grab gaze, HREF, raw, & pupil size data
-        if smp.isRightSample():
-            gaze = smp.getRightEye().getGaze()
-            href = smp.getRightEye().getHREF()
-            raw = smp.getRightEye().getRawPupil()
-            pupil = smp.getRightEye().getPupilSize()
-        elif smp.isLeftSample():
-            gaze = smp.getLeftEye().getGaze()
-            href = smp.getLeftEye().getHREF()
-            raw = smp.getLeftEye().getRawPupil()
-            pupil = smp.getLeftEye().getPupilSize()
-
-        timestamp = smp.getTime()
-        
-        # Save gaze, HREF, raw, & pupil data to the plain text
-        # file, if the sample is new
-        if timestamp > smp_time:
-            smp_data = map(str, [timestamp, gaze, href, raw, pupil])
-            text_file.write('\t'.join(smp_data) + '\n')
-            smp_time = timestamp
+    # Drain the samples queued since the last iteration
+    reader.drain()
+
+    # Hand over gaze, HREF, raw, & pupil data of the new samples to
+    # the writer thread
+    writer.put(reader.ring.read())
+
+    # Sleep a bit rather than polling the link in a busy loop
+    reader.wait()
 
 # Stop recording
 tk.stopRecording()
 
-# Close the plain text file
-text_file.close()  
+# Write the remaining samples and close the sample file
+writer.close()
+
+# Print the number of samples retrieved and lost, and whether the writer
+# kept up with the retrieval
+print(reader.report())
+print(writer.report())
+
+# Convert the sample file to CSV, e.g., for a spreadsheet; in Python, read
+# the samples with sample_record.open_records('sample_data.smp')
+to_csv('sample_data.smp', 'sample_data.csv')
 
 # Close the EDF data file on the Host
 tk.closeDataFile()
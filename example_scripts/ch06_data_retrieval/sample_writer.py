@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+#
+# Filename: sample_writer.py
+# Author: Zhiguo Wang
+# Date: 10/18/2026
+#
+# Description:
+# Write the samples retrieved over the link to a file in a background
+# thread, so formatting and disk I/O never hold up the link polling. The
+# acquisition loop hands over blocks of samples (NumPy structured arrays,
+# see link_reader.py) without waiting; the writer thread collects the
+# blocks and writes them in large chunks, as binary records (see
+# sample_record.py) or as CSV. An error in the writer thread (e.g., a
+# full disk) is raised again by the next put() or by close().
+
+import time
+import queue
+import threading
+import numpy as np
+from sample_record import write_header, write_csv
+
+
+class SampleWriter:
+    '''Write blocks of samples to a file in a background thread'''
+
+    def __init__(self, path, flags='', sample_rate=0, flush_size=1000,
+                 max_blocks=256, flush_interval=0.5):
+        '''Initialize, open the file and start the writer thread
+
+        path: the data file; a ".csv" file is written as text, others as
+              binary sample files, see sample_record.py
+        flags, sample_rate: the "link_sample_data" flags and the sampling
+                            rate, saved in the header of a binary file
+        flush_size: number of samples collected before writing a chunk
+        max_blocks: size of the queue, in blocks; if the queue is full,
+                    the blocks are kept by put() and handed over later
+        flush_interval: the longest time (in seconds) that collected
+                        samples wait to be written'''
+
+        self.path = path
+        self.csv = path.lower().endswith('.csv')
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(max_blocks)
+
+        # blocks that did not fit into the queue, held by the acquisition
+        # side until the writer catches up
+        self._pending = []
+
+        # the largest number of blocks waiting in the queue, the number of
+        # put() calls that found the queue full, and the samples written
+        self.high_water = 0
+        self.backpressure = 0
+        self.written = 0
+        self.chunks = 0
+
+        # the exception that stopped the writer thread, if any
+        self.error = None
+
+        if self.csv:
+            self._file = open(path, 'w')
+        else:
+            self._file = open(path, 'wb')
+            write_header(self._file, flags, sample_rate)
+        self._header_done = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def put(self, block):
+        '''Hand over a block of samples, never waits for the writer'''
+
+        if self.error is not None:
+            raise self.error
+        if len(block) == 0 and not self._pending:
+            return
+        if len(block):
+            self._pending.append(block)
+        try:
+            if len(self._pending) == 1:
+                self._queue.put_nowait(self._pending[0])
+            else:
+                self._queue.put_nowait(np.concatenate(self._pending))
+        except queue.Full:
+            self.backpressure += 1
+            return
+        self._pending = []
+        self.high_water = max(self.high_water, self._queue.qsize())
+
+    def _write(self, blocks):
+        '''Write the collected blocks as one chunk'''
+
+        data = np.concatenate(blocks)
+        if self.csv:
+            write_csv(self._file, data, not self._header_done)
+            self._header_done = True
+        else:
+            data.tofile(self._file)
+        self.written += len(data)
+        self.chunks += 1
+
+    def _run(self):
+        '''The writer thread, keep the error that stops it'''
+
+        try:
+            self._loop()
+        except Exception as e:
+            self.error = e
+
+    def _loop(self):
+        '''Collect and write the blocks; a None block marks the end'''
+
+        blocks = []
+        n = 0
+        while True:
+            try:
+                block = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                block = ()
+            if block is None:
+                break
+            if len(block):
+                blocks.append(block)
+                n += len(block)
+            # write a chunk if enough samples are collected, or if the
+            # queue is idle
+            if blocks and (n >= self.flush_size or not len(block)):
+                self._write(blocks)
+                blocks = []
+                n = 0
+        if blocks:
+            self._write(blocks)
+
+    def _hand_over(self, block, timeout):
+        '''Queue a block, waiting for room while the writer thread is
+        alive, for timeout seconds at most'''
+
+        deadline = time.monotonic() + timeout
+        while self._thread.is_alive() and time.monotonic() < deadline:
+            try:
+                self._queue.put(block, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def close(self, timeout=10.0):
+        '''Hand over the remaining samples, wait for the writer thread to
+        write them, then close the file
+
+        timeout: the longest time (in seconds) to wait for the writer
+                 thread to take the remaining samples, and to finish'''
+
+        if self._pending:
+            self._hand_over(np.concatenate(self._pending), timeout)
+            self._pending = []
+        self._hand_over(None, timeout)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            raise RuntimeError(f'{self.path}: the writer thread did not '
+                               f'finish in {timeout} s')
+        self._file.close()
+        if self.error is not None:
+            raise self.error
+
+    def report(self):
+        '''Summarize the writing, e.g., print it after close()'''
+
+        return (f'{self.written} samples written in {self.chunks} chunks, '
+                f'queue high-water mark {self.high_water} blocks, '
+                f'{self.backpressure} puts found the queue full')
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+#
+# Filename: benchmark_camera_image.py
+# Author: Zhiguo Wang
+# Date: 10/18/2026
+#
+# Description:
+# Compare the frame rate of the camera image conversion in
+# EyeLinkCoreGraphicsPsychoPy.draw_image_line(), i.e., the per-pixel
+# palette lookup loop in the original version and the NumPy lookup table
+# (eyelink_coregraphics.camera.CameraImage, the code the display uses).
+# The host sends a palette and the camera image line by line; we feed
+# synthetic frames through the same steps, without a tracker or a window.
+# Install eyelink_coregraphics first, "pip install -e example_scripts".
+
+import sys
+import time
+import array
+import functools
+import numpy as np
+from PIL import Image
+from eyelink_coregraphics.camera import CameraImage
+
+
+def synthetic_palette(n=256):
+    '''A gray-level palette, as the host would send to set_image_palette()
+
+    Return the r, g, b lists'''
+
+    levels = [int(i * 255 / (n - 1)) for i in range(n)]
+
+    return levels, levels, levels
+
+
+def synthetic_frame(width, height, n_colors=256):
+    '''A camera image of palette indices, one bytes object per line'''
+
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, n_colors, (height, width), dtype=np.uint8)
+
+    return [line.tobytes() for line in frame]
+
+
+def frame_with_loop(r, g, b, lines, width):
+    '''The per-pixel loop in the original draw_image_line()'''
+
+    pal = [(int(b[i]) << 16) | (int(g[i]) << 8) | int(r[i])
+           for i in range(len(r))]
+    buffer = array.array('I')
+    for buff in lines:
+        for i in range(width):
+            try:
+                buffer.append(pal[buff[i]])
+            except:
+                pass
+
+    return Image.frombytes('RGBX', (width, len(lines)), buffer.tobytes())
+
+
+def frame_with_lut(camera, r, g, b, lines, width):
+    '''The line buffer and palette lookup table in draw_image_line(),
+    i.e., CameraImage.add_line() and colors(); the camera image is
+    reused across frames, as in the display'''
+
+    camera.set_palette(r, g, b)
+    for line, buff in enumerate(lines, start=1):
+        camera.add_line(width, line, len(lines), buff)
+
+    return Image.fromarray(camera.colors())
+
+
+if __name__ == '__main__':
+    # Number of frames to convert for each image size
+    n_frames = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    r, g, b = synthetic_palette()
+    for width, height in [(192, 160), (384, 320), (640, 480)]:
+        lines = synthetic_frame(width, height)
+        print(f'Camera image {width} x {height}')
+        results = []
+        lut = functools.partial(frame_with_lut, CameraImage())
+        for name, convert in [('per-pixel loop', frame_with_loop),
+                              ('lookup table', lut)]:
+            t0 = time.perf_counter()
+            for _ in range(n_frames):
+                img = convert(r, g, b, lines, width)
+            t = time.perf_counter() - t0
+            results.append(img.convert('RGB'))
+            print(f'{name:>16}: {t/n_frames*1000:8.2f} ms/frame, '
+                  f'{n_frames/t:8.1f} frames/s')
+        assert results[0].tobytes() == results[1].tobytes()
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+#
+# Filename: benchmark_coregraphics.py
+# Author: Zhiguo Wang
+# Date: 10/18/2026
+#
+# Description:
+# Benchmark the custom calibration display (EyeLinkCoreGraphicsPsychoPy)
+# without a tracker. A fake host sends the palette and the camera image
+# lines, the cross hairs, the calibration targets and the key presses,
+# the same way the Host PC does during tracker setup. By default the
+# display draws into a stub window, and stub modules stand in for
+# psychopy (and for pylink, if it is not installed), so the benchmark runs
+# on any box with NumPy and Pillow, without a monitor; use "--window real"
+# to draw into a PsychoPy window instead (e.g., with xvfb-run on Linux).
+#
+# Usage:
+#     python benchmark_coregraphics.py --frames 300 --size 384x320
+#     python benchmark_coregraphics.py --recording camera_frames.npz
+#
+# A recording is an .npz file with the palette (r, g, b) and the camera
+# frames (an array of palette indices, n_frames x height x width).
+
+import gc
+import sys
+import time
+import types
+import argparse
+import importlib.util
+import tracemalloc
+import numpy as np
+
+# The pylink constants the display uses, for the stub pylink module
+PYLINK_CONSTANTS = [
+    'F1_KEY', 'F2_KEY', 'F3_KEY', 'F4_KEY', 'F5_KEY', 'F6_KEY', 'F7_KEY',
+    'F8_KEY', 'F9_KEY', 'F10_KEY', 'PAGE_UP', 'PAGE_DOWN', 'CURS_UP',
+    'CURS_DOWN', 'CURS_LEFT', 'CURS_RIGHT', 'ENTER_KEY',
+    'CAL_TARG_BEEP', 'DC_TARG_BEEP', 'CAL_ERR_BEEP', 'DC_ERR_BEEP',
+    'CAL_GOOD_BEEP', 'DC_GOOD_BEEP', 'CR_HAIR_COLOR', 'PUPIL_HAIR_COLOR',
+    'PUPIL_BOX_COLOR', 'SEARCH_LIMIT_BOX_COLOR', 'MOUSE_CURSOR_COLOR']
+
+
+class StubStim:
+    '''A stimulus that only counts the draw() calls'''
+
+    def __init__(self, win, *args, **kwargs):
+        self.win = win
+        self.__dict__.update(kwargs)
+
+    def draw(self):
+        self.win.draws += 1
+
+
+class StubWindow:
+    '''A window that does not draw anything, flip() returns immediately'''
+
+    def __init__(self, size=(1280, 800), color=(0, 0, 0)):
+        self.size = size
+        self.color = color
+        self.mouseVisible = True
+        self.winHandle = None
+        self.screen = 0
+        self.draws = 0
+        self.flips = 0
+
+    def flip(self):
+        self.flips += 1
+        return time.perf_counter()
+
+    def clearBuffer(self):
+        pass
+
+
+class StubMouse:
+    '''A mouse that stays at the center of the window'''
+
+    def __init__(self, visible=False):
+        pass
+
+    def getPos(self):
+        return (0.0, 0.0)
+
+    def getPressed(self):
+        return [0, 0, 0]
+
+
+class StubCustomDisplay:
+    '''Stands in for pylink.EyeLinkCustomDisplay'''
+
+    def __init__(self):
+        pass
+
+    def draw_cross_hair(self):
+        pass
+
+
+class StubKeyInput:
+    '''Stands in for pylink.KeyInput'''
+
+    def __init__(self, key, modifier):
+        self.key = key
+        self.modifier = modifier
+
+
+class FakeHost:
+    '''Send the camera image, cross hairs, targets and key presses to a
+    custom display, as the Host PC does'''
+
+    def __init__(self, width=384, height=320, n_frames=60, recording=None):
+        '''Initialize
+
+        width, height: size of the synthetic camera image
+        n_frames: number of synthetic frames, which are sent in turn
+        recording: path to an .npz file of recorded camera frames'''
+
+        if recording is None:
+            levels = np.linspace(0, 255, 256).astype(int).tolist()
+            self.palette = (levels, levels, levels)
+            self.frames = self._synthetic_frames(width, height, n_frames)
+        else:
+            data = np.load(recording)
+            self.palette = (data['r'].tolist(), data['g'].tolist(),
+                            data['b'].tolist())
+            self.frames = [[line.tobytes() for line in frame]
+                           for frame in data['frames'].astype(np.uint8)]
+        self.keys = []
+
+    @staticmethod
+    def _synthetic_frames(width, height, n_frames):
+        '''An eye image: noise, a dark pupil moving along a circle and a
+        bright corneal reflection; each frame is a list of bytes lines'''
+
+        rng = np.random.default_rng(0)
+        y, x = np.mgrid[0:height, 0:width]
+        frames = []
+        for k in range(n_frames):
+            angle = 2 * np.pi * k / n_frames
+            cx = width / 2 + width / 8 * np.cos(angle)
+            cy = height / 2 + height / 8 * np.sin(angle)
+            img = rng.integers(120, 200, (height, width))
+            img[np.hypot(x - cx, y - cy) < height / 8] = 20
+            img[np.hypot(x - cx - 10, y - cy - 10) < height / 40] = 250
+            frames.append([line.tobytes() for line in img.astype(np.uint8)])
+
+        return frames
+
+    def send_palette(self, display):
+        display.set_image_palette(*self.palette)
+
+    def send_frame(self, display, k):
+        '''Send frame k line by line
+
+        Return the time (in seconds) of each draw_image_line() call'''
+
+        frame = self.frames[k % len(self.frames)]
+        height = len(frame)
+        width = len(frame[0])
+        t = np.empty(height)
+        for line, buff in enumerate(frame, start=1):
+            t0 = time.perf_counter()
+            display.draw_image_line(width, line, height, buff)
+            t[line - 1] = time.perf_counter() - t0
+
+        return t
+
+    def cross_hair(self, display):
+        '''The cross hairs and boxes the host draws over the camera image,
+        in the 192 x 160 host coordinate space'''
+
+        display.draw_line(60, 80, 132, 80, pylink.PUPIL_HAIR_COLOR)
+        display.draw_line(96, 50, 96, 110, pylink.PUPIL_HAIR_COLOR)
+        display.draw_line(100, 72, 116, 72, pylink.CR_HAIR_COLOR)
+        display.draw_line(108, 64, 108, 80, pylink.CR_HAIR_COLOR)
+        display.draw_lozenge(70, 55, 52, 50, pylink.PUPIL_BOX_COLOR)
+        display.draw_lozenge(20, 30, 152, 100, pylink.SEARCH_LIMIT_BOX_COLOR)
+
+    def press(self, key, n=1):
+        '''Queue key presses for the next key poll'''
+
+        self.keys.extend([(key, {'alt': False, 'ctrl': False,
+                                 'shift': False})] * n)
+
+    def get_keys(self, modifiers=False):
+        keys, self.keys = self.keys, []
+        return keys
+
+
+class GCTimer:
+    '''Record the garbage collection pauses'''
+
+    def __init__(self):
+        self.pauses = []
+        self._start = None
+
+    def __call__(self, phase, info):
+        if phase == 'start':
+            self._start = time.perf_counter()
+        elif self._start is not None:
+            self.pauses.append(time.perf_counter() - self._start)
+            self._start = None
+
+    def __enter__(self):
+        gc.callbacks.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        gc.callbacks.remove(self)
+
+
+def _module(name, **attrs):
+    '''Create a module with the given attributes, and put it into
+    sys.modules, so it is imported in place of the real one'''
+
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    sys.modules[name] = module
+
+    return module
+
+
+def install_stubs(host):
+    '''Put stub psychopy modules (and a stub pylink module if pylink is
+    not installed) into sys.modules, before the display is imported; the
+    key presses come from the fake host
+
+    Return a stub window'''
+
+    visual = _module('psychopy.visual', ImageStim=StubStim,
+                     TextStim=StubStim, GratingStim=StubStim)
+    event = _module('psychopy.event', Mouse=StubMouse,
+                    getKeys=host.get_keys)
+    core = _module('psychopy.core', getTime=time.perf_counter,
+                   wait=time.sleep)
+    _module('psychopy', visual=visual, event=event, core=core)
+
+    if importlib.util.find_spec('pylink') is None:
+        constants = {name: k for k, name in
+                     enumerate(PYLINK_CONSTANTS, start=1)}
+        _module('pylink', EyeLinkCustomDisplay=StubCustomDisplay,
+                KeyInput=StubKeyInput, **constants)
+
+    return StubWindow()
+
+
+def summarize(name, t, unit=1e3, label='ms'):
+    '''Print the mean, median and 99th percentile of the timing data'''
+
+    t = np.asarray(t) * unit
+    print(f'{name:>22}: mean {t.mean():8.3f} {label}, '
+          f'median {np.median(t):8.3f} {label}, '
+          f'99% {np.percentile(t, 99):8.3f} {label}, n = {len(t)}')
+
+
+def run(display, host, n_frames):
+    '''Drive the display with the fake host and print the results'''
+
+    # the camera image
+    host.send_palette(display)
+    height = len(host.frames[0])
+    width = len(host.frames[0][0])
+    display.setup_image_display(width, height)
+    display.image_title('camera image')
+    display.draw_cross_hair = lambda: host.cross_hair(display)
+    host.send_frame(display, 0)
+
+    with GCTimer() as gc_timer:
+        line_t = np.array([host.send_frame(display, k)
+                           for k in range(n_frames)])
+    frame_t = line_t.sum(axis=1)
+    print(f'Camera image ({width} x {height}, {n_frames} frames)')
+    summarize('frame', frame_t)
+    summarize('line', line_t[:, :-1].ravel(), 1e6, 'us')
+    # the last line of a frame also converts and shows the image
+    summarize('last line', line_t[:, -1])
+    print(f'{"frames/s":>22}: {n_frames / frame_t.sum():8.1f}')
+    print(f'{"GC pauses":>22}: {len(gc_timer.pauses)}, '
+          f'{sum(gc_timer.pauses) * 1e3:.3f} ms in total')
+
+    # memory allocated per frame, measured in a separate pass because
+    # tracing slows down the code; tracemalloc.reset_peak() needs Python
+    # 3.9 or later
+    has_peak = hasattr(tracemalloc, 'reset_peak')
+    tracemalloc.start()
+    peaks = []
+    blocks = []
+    for k in range(min(n_frames, 30)):
+        if has_peak:
+            tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        n_blocks = sys.getallocatedblocks()
+        host.send_frame(display, k)
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+        blocks.append(sys.getallocatedblocks() - n_blocks)
+    tracemalloc.stop()
+    if has_peak:
+        peak = f'peak {np.mean(peaks) / 1024:.1f} KB'
+    else:
+        peak = 'peak n/a (Python 3.9+)'
+    print(f'{"allocated per frame":>22}: {peak}, '
+          f'net {np.mean(blocks):.1f} blocks')
+
+    # calibration targets, a 5 x 5 grid
+    display.exit_image_display()
+    display.setup_cal_display()
+    w, h = display._w, display._h
+    target_t = []
+    for x in np.linspace(w * 0.1, w * 0.9, 5):
+        for y in np.linspace(h * 0.1, h * 0.9, 5):
+            t0 = time.perf_counter()
+            display.erase_cal_target()
+            display.draw_cal_target(x, y)
+            target_t.append(time.perf_counter() - t0)
+    print('Calibration targets')
+    summarize('erase + draw target', target_t)
+
+    # key polls, mostly empty, as during tracker setup; with a real
+    # window the keys come from the keyboard
+    polls = 10000
+    for k in range(polls):
+        if k % 100 == 0:
+            host.press('c')
+        display.get_input_key()
+        display.get_mouse_state()
+    print(f'Key and mouse polls ({polls} each)')
+    for line in display.poll_report().splitlines():
+        print(f'{"":>10}{line}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark the custom calibration display')
+    parser.add_argument('--frames', type=int, default=300,
+                        help='number of camera frames to send')
+    parser.add_argument('--size', default='384x320',
+                        help='size of the synthetic camera image')
+    parser.add_argument('--recording', default=None,
+                        help='an .npz file of recorded camera frames')
+    parser.add_argument('--window', default='stub', choices=['stub', 'real'],
+                        help='draw into a stub or a PsychoPy window')
+    args = parser.parse_args()
+
+    width, height = map(int, args.size.lower().split('x'))
+    host = FakeHost(width, height, recording=args.recording)
+
+    if args.window == 'stub':
+        win = install_stubs(host)
+    else:
+        from psychopy import visual
+        win = visual.Window((1280, 800), fullscr=False, units='pix')
+
+    # import the display after the stubs are in place
+    import pylink
+    from eyelink_coregraphics.psychopy_display import \
+        EyeLinkCoreGraphicsPsychoPy
+
+    display = EyeLinkCoreGraphicsPsychoPy(None, win)
+    if args.window == 'stub':
+        # no sound device is needed with a stub window
+        display._beeps = {}
+    run(display, host, args.frames)
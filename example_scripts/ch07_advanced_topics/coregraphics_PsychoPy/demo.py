@@ -6,11 +6,11 @@
 #
 # Description:
 # This short script shows how to request Pylink to use the
-# EyeLinkCoreGraphcicPsychoPy library
+# EyeLinkCoreGraphcicPsychoPy library (see example_scripts/eyelink_coregraphics)
 
 import pylink
 from psychopy import visual, core, event, monitors
-from EyeLinkCoreGraphicsPsychoPy import EyeLinkCoreGraphicsPsychoPy
+from eyelink_coregraphics import EyeLinkCoreGraphicsPsychoPy
 
 # Connect to the tracker
 tk = pylink.EyeLink('100.1.1.1')
@@ -34,6 +34,10 @@ pylink.openGraphicsEx(genv)
 # press C to calibrate, V to validate, O to exit the calibration routine
 tk.doTrackerSetup()
 
+# How often the host polled the keyboard and mouse, and the CPU time
+# these calls took
+print(genv.poll_report())
+
 # Close the connection to the tracker
 tk.close()
 
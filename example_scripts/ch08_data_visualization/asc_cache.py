@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+#
+# Filename: asc_cache.py
+# Author: Zhiguo Wang
+# Date: 10/18/2026
+#
+# Description:
+# Cache the parsed samples, events, messages, and trial boundaries of
+# an ASC file in an uncompressed .npz file next to the ASC file, so
+# plotting scripts do not need to parse the ASC file again.
+
+import os
+import json
+import zipfile
+import hashlib
+import tempfile
+import numpy as np
+import pandas as pd
+from asc_parser import load_samples, parse_events, trial_boundaries
+
+# Bump the version when the layout of the cached data changes
+CACHE_VERSION = 2
+
+# Name of the cache folder, in the same folder as the ASC file
+CACHE_DIR = '.asc_cache'
+
+# The event data frames stored in a session
+_FRAMES = ['efix', 'esac', 'eblink', 'msg', 'trials']
+
+
+def file_hash(path, block_size=1 << 20):
+    '''Hash the content of a file with BLAKE2b, block by block'''
+
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            h.update(block)
+
+    return h.hexdigest()
+
+
+def _cache_path(asc_path, cache_dir, eye='R'):
+    '''The cache file of an ASC file, named after the absolute path and
+    the eye'''
+
+    asc_path = os.path.abspath(asc_path)
+    path_hash = hashlib.blake2b(asc_path.encode(), digest_size=6).hexdigest()
+    name = os.path.splitext(os.path.basename(asc_path))[0]
+
+    return os.path.join(cache_dir, f'{name}-{path_hash}-{eye or "LR"}.npz')
+
+
+def _read_meta(npz):
+    '''Retrieve the metadata (a JSON string) from an opened .npz file'''
+
+    try:
+        return json.loads(str(npz['meta']))
+    except (KeyError, ValueError):
+        return None
+
+
+def parse_session(asc_path, start='image_onset', end='image_offset',
+                  eye='R'):
+    '''Parse an ASC file, without using the cache
+
+    asc_path: path to the ASC file
+    start, end: message text marking the start and end of a trial
+    eye: the eye of the events, 'L', 'R', or None for both eyes, see
+         asc_parser.parse_events()
+
+    Return a dict: 'samples' (a dict of arrays, see load_samples()),
+    'efix', 'esac', 'eblink', 'msg', and 'trials' (pandas data frames)'''
+
+    session = parse_events(asc_path, eye=eye)
+    session['samples'] = load_samples(asc_path)
+    session['trials'] = trial_boundaries(session['msg'], start, end)
+
+    return session
+
+
+def save_session(session, npz_path, meta):
+    '''Write a parsed session to an .npz file, column by column
+
+    session: a dict returned by parse_session()
+    npz_path: path of the .npz file
+    meta: a dict of metadata, stored as a JSON string'''
+
+    arrays = {'meta': np.array(json.dumps(meta))}
+    for name, col in session['samples'].items():
+        arrays[f'samples.{name}'] = col
+    for frame in _FRAMES:
+        for name, col in session[frame].items():
+            col = col.to_numpy()
+            if col.dtype == object:  # message text
+                col = col.astype(str)
+            arrays[f'{frame}.{name}'] = col
+
+    # Write to a temporary file first, so an interrupted write never
+    # leaves a broken cache file behind
+    fd, tmp_path = tempfile.mkstemp(suffix='.npz',
+                                    dir=os.path.dirname(npz_path))
+    with os.fdopen(fd, 'wb') as f:
+        np.savez(f, **arrays)
+    # mkstemp creates the file readable by the owner only, give it the
+    # permissions of a normally created file
+    umask = os.umask(0)
+    os.umask(umask)
+    os.chmod(tmp_path, 0o666 & ~umask)
+    os.replace(tmp_path, npz_path)
+
+
+def read_session(npz):
+    '''Put the arrays in an opened .npz file back into a session dict'''
+
+    session = {'samples': {}}
+    frames = {frame: {} for frame in _FRAMES}
+    for key in npz.files:
+        if key == 'meta':
+            continue
+        group, name = key.split('.', 1)
+        if group == 'samples':
+            session['samples'][name] = npz[key]
+        else:
+            frames[group][name] = npz[key]
+    for frame in _FRAMES:
+        session[frame] = pd.DataFrame(frames[frame])
+
+    return session
+
+
+def evict(cache_dir, max_entries=16, max_bytes=4 << 30, keep=None):
+    '''Remove the least recently used cache files, so the cache folder
+    holds no more than max_entries files and max_bytes bytes
+
+    keep: a cache file that is never removed, e.g., the one just written,
+          even if it is larger than max_bytes on its own
+
+    Return a list of the removed files'''
+
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith('.npz') and entry.is_file():
+            st = entry.stat()
+            entries.append((st.st_mtime, st.st_size, entry.path))
+
+    # Newest first, a cache hit touches the cache file
+    entries.sort(reverse=True)
+    removed = []
+    total = 0
+    for i, (_, size, path) in enumerate(entries):
+        total += size
+        if path == keep:
+            continue
+        if i >= max_entries or total > max_bytes:
+            os.remove(path)
+            removed.append(path)
+
+    return removed
+
+
+def load_session(asc_path, start='image_onset', end='image_offset',
+                 eye='R', cache_dir=None, max_entries=16,
+                 max_bytes=4 << 30):
+    '''Load a parsed ASC file from the cache, or parse the ASC file and
+    add it to the cache
+
+    A cache file is valid if the size and modification time of the ASC
+    file are unchanged. If only the modification time has changed (e.g.,
+    edf2asc has converted the same EDF again), the content hash decides.
+    A corrupt or truncated cache file is parsed again.
+
+    asc_path: path to the ASC file
+    start, end: message text marking the start and end of a trial
+    eye: the eye of the events, see parse_session(); each eye is cached
+         separately
+    cache_dir: the cache folder, default to .asc_cache next to the ASC
+    max_entries, max_bytes: limits of the cache folder, see evict()
+
+    Return a dict, see parse_session()'''
+
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(asc_path), CACHE_DIR)
+    os.makedirs(cache_dir, exist_ok=True)
+    npz_path = _cache_path(asc_path, cache_dir, eye)
+
+    st = os.stat(asc_path)
+    key = {'version': CACHE_VERSION, 'size': st.st_size,
+           'mtime_ns': st.st_mtime_ns, 'start': start, 'end': end,
+           'eye': eye}
+
+    content_hash = None
+    session = None
+    if os.path.exists(npz_path):
+        try:
+            with np.load(npz_path) as npz:
+                meta = _read_meta(npz)
+                if meta is not None and \
+                   all(meta.get(k) == key[k] for k in
+                       ['version', 'size', 'start', 'end', 'eye']):
+                    if meta['mtime_ns'] != key['mtime_ns']:
+                        content_hash = file_hash(asc_path)
+                    if content_hash is None or \
+                       content_hash == meta['hash']:
+                        session = read_session(npz)
+        except (OSError, ValueError, KeyError, EOFError,
+                zipfile.BadZipFile):
+            # a corrupt or truncated cache file, parse the ASC file again
+            session = None
+
+    if session is not None:
+        if content_hash is not None:
+            # same content, new modification time; update the cache key
+            save_session(session, npz_path, dict(key, hash=content_hash))
+        else:
+            # mark the cache file as recently used
+            os.utime(npz_path)
+        return session
+
+    session = parse_session(asc_path, start, end, eye)
+    if content_hash is None:
+        content_hash = file_hash(asc_path)
+    save_session(session, npz_path, dict(key, hash=content_hash))
+    evict(cache_dir, max_entries, max_bytes, keep=npz_path)
+
+    return session
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+#
+# Filename: asc_index.py
+# Author: Zhiguo Wang
+# Date: 10/18/2026
+#
+# Description:
+# Index the byte offsets of the TRIALID, trial onset, trial offset, and
+# TRIAL_RESULT messages in an ASC file, so we can seek straight to a
+# trial instead of reading the file from the beginning.
+
+import os
+import sys
+import json
+from asc_parser import load_samples, parse_events
+
+# Bump the version when the layout of the index file changes
+INDEX_VERSION = 1
+
+
+def index_path(asc_path):
+    '''The index (sidecar) file of an ASC file'''
+
+    return asc_path + '.idx'
+
+
+def _new_trial(pos, trial_id=None):
+    '''Byte offsets (-1 if missing) and timestamps of a new trial'''
+
+    return {'trial_id': trial_id, 'start': pos, 'end': -1,
+            'trialid': pos if trial_id is not None else -1,
+            'onset': -1, 'offset': -1, 'result': -1,
+            'onset_time': -1, 'offset_time': -1}
+
+
+def build_index(asc_path, start='image_onset', end='image_offset'):
+    '''Scan an ASC file once and record the byte offset of the messages
+    marking the trials
+
+    A trial begins with the TRIALID message (or the start message if
+    there is no TRIALID message) and ends with the TRIAL_RESULT message
+    (or the end message if there is no TRIAL_RESULT message).
+
+    asc_path: path to the ASC file
+    start, end: message text marking the start and end of a trial
+
+    Return the index as a dict, which is also saved to index_path()'''
+
+    start = start.encode()
+    end = end.encode()
+    trials = []
+    trial = None
+    pos = 0
+    with open(asc_path, 'rb') as asc:
+        for line in asc:
+            line_end = pos + len(line)
+            # MSG	94711517 image_onset
+            if line.startswith(b'MSG'):
+                tokens = line.split(None, 2)
+                text = tokens[2].rstrip() if len(tokens) > 2 else b''
+                timestamp = int(tokens[1])
+                if text.startswith(b'TRIALID'):
+                    # MSG	94711000 TRIALID 1
+                    trial = _new_trial(pos, text[8:].decode().strip())
+                    trials.append(trial)
+                elif text == start:
+                    if trial is None or trial['onset'] >= 0:
+                        trial = _new_trial(pos)
+                        trials.append(trial)
+                    trial['onset'] = pos
+                    trial['onset_time'] = timestamp
+                elif text == end and trial is not None:
+                    trial['offset'] = pos
+                    trial['offset_time'] = timestamp
+                    trial['end'] = line_end
+                elif text.startswith(b'TRIAL_RESULT') and trial is not None:
+                    trial['result'] = pos
+                    trial['end'] = line_end
+                    trial = None
+            pos = line_end
+
+    # A trial without an end message extends to the end of the file
+    for trial in trials:
+        if trial['end'] < 0:
+            trial['end'] = pos
+
+    st = os.stat(asc_path)
+    index = {'version': INDEX_VERSION, 'size': st.st_size,
+             'mtime_ns': st.st_mtime_ns, 'start': start.decode(),
+             'end': end.decode(), 'trials': trials}
+    with open(index_path(asc_path), 'w') as f:
+        json.dump(index, f)
+
+    return index
+
+
+def load_index(asc_path, start='image_onset', end='image_offset'):
+    '''Read the index of an ASC file, the index is (re)built if it
+    does not exist or the ASC file has changed
+
+    Return the index as a dict, see build_index()'''
+
+    st = os.stat(asc_path)
+    try:
+        with open(index_path(asc_path)) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = None
+
+    if index is None or \
+       [index.get(k) for k in ['version', 'size', 'mtime_ns', 'start',
+                               'end']] != \
+       [INDEX_VERSION, st.st_size, st.st_mtime_ns, start, end]:
+        index = build_index(asc_path, start, end)
+
+    return index
+
+
+def read_trial_lines(asc_path, n, start='image_onset', end='image_offset'):
+    '''Read the lines of a trial, without reading the preceding trials
+
+    asc_path: path to the ASC file
+    n: trial number, starting from 1
+
+    Return a list of lines'''
+
+    trials = load_index(asc_path, start, end)['trials']
+    if not 1 <= n <= len(trials):
+        raise IndexError(f'trial {n} out of range (1-{len(trials)})')
+    trial = trials[n - 1]
+
+    with open(asc_path, 'rb') as asc:
+        asc.seek(trial['start'])
+        data = asc.read(trial['end'] - trial['start'])
+
+    return data.decode().splitlines(keepends=True)
+
+
+def load_trial(asc_path, n, start='image_onset', end='image_offset',
+               eye='R'):
+    '''Parse a single trial of an ASC file
+
+    asc_path: path to the ASC file
+    n: trial number, starting from 1
+    start, end: message text marking the start and end of a trial
+    eye: the eye of the events, 'L', 'R', or None for both eyes, see
+         asc_parser.parse_events()
+
+    Return a dict: 'samples' (a dict of arrays, see load_samples()),
+    'efix', 'esac', 'eblink', and 'msg' (pandas data frames)'''
+
+    lines = read_trial_lines(asc_path, n, start, end)
+    trial = parse_events(lines, eye=eye)
+    trial['samples'] = load_samples(lines)
+
+    return trial
+
+
+if __name__ == '__main__':
+    # Build the index of an ASC file and list the trials
+    asc_path = sys.argv[1] if len(sys.argv) > 1 else \
+        os.path.join('freeview', 'freeview.asc')
+    index = build_index(asc_path)
+    for i, trial in enumerate(index['trials'], start=1):
+        print(f'trial # {i}: bytes {trial["start"]}-{trial["end"]}, '
+              f'onset {trial["onset_time"]}, offset {trial["offset_time"]}')
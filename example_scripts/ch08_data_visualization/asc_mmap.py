@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+#
+# Filename: asc_mmap.py
+# Author: Zhiguo Wang
+# Date: 10/18/2026
+#
+# Description:
+# Read the samples from an ASC file through a memory map. The newline
+# and tab positions are located with NumPy, and the numerical fields
+# are converted column by column, so no Python string is created for
+# the individual lines.
+
+import os
+import mmap
+import numpy as np
+from asc_parser import SAMPLE_COLS, SampleBuffer
+
+# ASCII codes
+_TAB, _NEWLINE, _MINUS, _DOT, _SPACE = 9, 10, 45, 46, 32
+
+# The widest numerical field we expect, e.g., "-32768.0", "9999999999"
+_MAX_WIDTH = 24
+
+
+def _parse_fields(buf, first, last, dtype):
+    '''Convert the numerical fields buf[first:last] into numbers,
+    a field without any digit (e.g., '.' for tracking loss) becomes NaN
+
+    buf: a uint8 array
+    first, last: arrays of the start and end positions of the fields
+    dtype: the NumPy data type of the returned array'''
+
+    width = min(int((last - first).max()), _MAX_WIDTH) if len(first) else 0
+
+    # Copy the fields into a 2-D array (one column per field), right
+    # aligned, and padded with spaces; each row holds the characters at
+    # the same position of all fields, so the rows are contiguous
+    idx = np.arange(-width, 0)[:, None] + last
+    chars = buf[np.maximum(idx, 0)]
+    chars[idx < first] = _SPACE
+
+    digit = chars - np.uint8(48)
+    is_digit = digit <= 9
+
+    # Accumulate the digits, ignoring the decimal point, and count the
+    # digits after the decimal point
+    n = len(first)
+    value = np.zeros(n, np.int64)
+    n_frac = np.zeros(n, np.int64)
+    after_dot = np.zeros(n, bool)
+    for j in range(width):
+        d = is_digit[j]
+        np.multiply(value, 10, out=value, where=d)
+        np.add(value, digit[j], out=value, where=d)
+        n_frac += d & after_dot
+        after_dot |= chars[j] == _DOT
+
+    negative = (chars == _MINUS).any(axis=0)
+    value[negative] *= -1
+
+    if np.dtype(dtype).kind != 'f':
+        return value.astype(dtype)
+
+    result = value / 10.0 ** n_frac
+    result[~is_digit.any(axis=0)] = np.nan
+
+    return result.astype(dtype)
+
+
+def _parse_chunk(buf, columns):
+    '''Extract the sample columns from a chunk of complete lines
+
+    buf: a uint8 array ending with a newline
+    columns: a list of (name, dtype) tuples, e.g., SAMPLE_COLS
+
+    Return a dict of arrays'''
+
+    newlines = np.flatnonzero(buf == _NEWLINE)
+    starts = np.concatenate(([0], newlines[:-1] + 1))
+    ends = newlines
+
+    # A sample line always starts with a numerical literal
+    head = buf[starts]
+    is_sample = (head >= 48) & (head <= 57)
+    starts = starts[is_sample]
+    ends = ends[is_sample]
+
+    # The first tab following the start of each sample line; a sentinel
+    # tab past the end of the chunk marks the absence of a tab
+    tabs = np.concatenate((np.flatnonzero(buf == _TAB), [len(buf)]))
+    n_fields = len(columns)
+    tab_idx = np.minimum(np.searchsorted(tabs, starts)[:, None] +
+                         np.arange(n_fields), len(tabs) - 1)
+    field_tabs = tabs[tab_idx]
+
+    # Lines with fewer fields than requested are skipped
+    if n_fields > 1:
+        valid = field_tabs[:, n_fields - 2] < ends
+        starts = starts[valid]
+        ends = ends[valid]
+        field_tabs = field_tabs[valid]
+
+    data = {}
+    first = starts
+    for k, (name, dtype) in enumerate(columns):
+        last = np.minimum(field_tabs[:, k], ends)
+        data[name] = _parse_fields(buf, first, last, dtype)
+        first = last + 1
+
+    return data
+
+
+def read_samples(asc_path, columns=SAMPLE_COLS, chunk_bytes=1 << 24):
+    '''Read the samples from an ASC file through a memory map
+
+    asc_path: path to the ASC file
+    columns: a list of (name, dtype) tuples, the leading fields of the
+             sample lines; default to timestamp, gaze_x, gaze_y, pupil
+    chunk_bytes: size of the chunks to process at a time, which bounds
+                 the working memory besides the returned arrays
+
+    Return a dict of arrays, the same as asc_parser.load_samples()'''
+
+    size = os.path.getsize(asc_path)
+    buffer = None
+    if size == 0:
+        return SampleBuffer(1, columns).columns()
+
+    with open(asc_path, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        whole = np.frombuffer(mm, np.uint8)
+        pos = 0
+        while pos < size:
+            stop = min(pos + chunk_bytes, size)
+            if stop < size:
+                # Cut the chunk at the last complete line
+                newlines = np.flatnonzero(whole[pos:stop] == _NEWLINE)
+                stop = pos + int(newlines[-1]) + 1 if len(newlines) else size
+            chunk = whole[pos:stop]
+            if chunk[-1] != _NEWLINE:
+                chunk = np.append(chunk, np.uint8(_NEWLINE))
+
+            data = _parse_chunk(chunk, columns)
+            if buffer is None:
+                # Preallocate for the whole file, based on the density of
+                # samples in the first chunk
+                n = len(next(iter(data.values())))
+                capacity = max(int(n * size / (stop - pos) * 1.05), 1)
+                buffer = SampleBuffer(capacity, columns)
+            buffer.extend(data)
+            pos = stop
+
+        # Release the view before the memory map is closed
+        del whole, chunk
+
+    return buffer.columns()
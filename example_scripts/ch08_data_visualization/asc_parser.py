@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+#
+# Filename: asc_parser.py
+# Author: Zhiguo Wang
+# Date: 10/18/2026
+#
+# Description:
+# A single-pass parser for the event lines (EFIX, ESACC, EBLINK, MSG)
+# in an ASC file. Lines are classified by their leading token with a
+# dispatch table, so the sample lines are skipped without tokenizing.
+# The samples are loaded into NumPy columns by load_samples().
+# iter_events(), iter_samples(), and iter_trials() stream the data,
+# so a long recording can be processed in constant memory.
+
+import os
+import contextlib
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+
+# Column names and data types of the events, following the eye label
+# EFIX R 80790054 80790349 296 981.3 554.5 936 63.50 63.50
+EFIX_COLS = [('startT', 'int64'), ('endT', 'int64'), ('duration', 'int64'),
+             ('avgX', 'float64'), ('avgY', 'float64'),
+             ('avgPupil', 'float64'),
+             ('resX', 'float64'), ('resY', 'float64')]
+# ESACC R 80790350 80790372 23 982.6 551.8 864.9 587.9 1.94 151 63.5 63.5
+ESAC_COLS = [('startT', 'int64'), ('endT', 'int64'), ('duration', 'int64'),
+             ('startX', 'float64'), ('startY', 'float64'),
+             ('endX', 'float64'), ('endY', 'float64'),
+             ('amplitude', 'float64'), ('peakVel', 'float64'),
+             ('resX', 'float64'), ('resY', 'float64')]
+# EBLINK R 80790350 80790372 23
+EBLINK_COLS = [('startT', 'int64'), ('endT', 'int64'), ('duration', 'int64')]
+# 80855874	 1506.4	  269.0	  729.0	...
+SAMPLE_COLS = [('timestamp', 'int64'), ('gaze_x', 'float32'),
+               ('gaze_y', 'float32'), ('pupil', 'float32')]
+
+# Typed records yielded by iter_events(); the resolution fields are only
+# available in ASC files converted with the -res option
+Fixation = namedtuple('Fixation', ['eye'] + [c for c, _ in EFIX_COLS],
+                      defaults=(np.nan, np.nan))
+Saccade = namedtuple('Saccade', ['eye'] + [c for c, _ in ESAC_COLS],
+                     defaults=(np.nan, np.nan))
+Blink = namedtuple('Blink', ['eye'] + [c for c, _ in EBLINK_COLS])
+Message = namedtuple('Message', ['timestamp', 'text'])
+
+# Lines starting with these characters are never events or messages,
+# e.g., samples, header lines, and the calibration results
+_SKIP_CHARS = frozenset('0123456789 \t\r\n*')
+# A sample line always starts with a numerical literal
+_DIGITS = frozenset('0123456789')
+
+
+def _open_lines(asc):
+    '''Open an ASC file, or pass through an iterable of lines'''
+
+    if isinstance(asc, (str, os.PathLike)):
+        return open(asc)
+
+    return contextlib.nullcontext(asc)
+
+
+def _to_column(values, dtype):
+    '''Convert a sequence of number strings into a typed NumPy array,
+    missing values ('.') are converted to NaN
+
+    values: a sequence of strings, e.g., ('645.5', '.', '421.4')
+    dtype: the NumPy data type of the column'''
+
+    if np.dtype(dtype).kind != 'f':
+        return np.fromiter(map(int, values), dtype, len(values))
+    try:
+        return np.fromiter(map(float, values), dtype, len(values))
+    except ValueError:
+        # only blocks with missing values take the slower path
+        values = ['nan' if v.strip() == '.' else v for v in values]
+        return np.fromiter(map(float, values), dtype, len(values))
+
+
+def _to_frame(rows, columns):
+    '''Put the event fields into a pandas data frame, one column at a time
+
+    rows: a list of tokenized event lines (without the event label & eye)
+    columns: a list of (name, dtype) tuples, e.g., EFIX_COLS'''
+
+    if not rows:
+        return pd.DataFrame({name: np.empty(0, dtype)
+                             for name, dtype in columns})
+
+    # Events parsed without resolution data (-res) have fewer columns,
+    # zip() stops at the shortest row
+    data = {}
+    for (name, dtype), values in zip(columns, zip(*rows)):
+        data[name] = _to_column(values, dtype)
+
+    return pd.DataFrame(data)
+
+
+def parse_events(asc, eye='R'):
+    '''Extract the fixation, saccade, blink end events and the messages
+    from an ASC file in a single pass
+
+    asc: path to the ASC file, or an iterable of lines (e.g., a file)
+    eye: 'L' or 'R', events from the other eye are skipped;
+         set to None to keep the events from both eyes
+
+    Return a dict of pandas data frames: 'efix', 'esac', 'eblink',
+    and 'msg' (timestamp and text of each message)'''
+
+    efix = []
+    esac = []
+    eblink = []
+    msg_time = []
+    msg_text = []
+
+    def _event(store):
+        '''Create a handler to tokenize an event line'''
+
+        def _handler(line):
+            tokens = line.split()
+            if eye is None or tokens[1] == eye:
+                store.append(tokens[2:])
+        return _handler
+
+    def _message(line):
+        '''Split a message line into the timestamp and the text'''
+
+        # MSG	3558923 !V IMGLOAD FILL images/woods.jpg
+        tokens = line.rstrip('\r\n').split(None, 2)
+        msg_time.append(tokens[1])
+        msg_text.append(tokens[2] if len(tokens) > 2 else '')
+
+    # The dispatch table, the key is the leading token of a line
+    dispatch = {'EFIX': _event(efix),
+                'ESACC': _event(esac),
+                'EBLINK': _event(eblink),
+                'MSG': _message}
+
+    with _open_lines(asc) as lines:
+        for line in lines:
+            # Skip the sample lines as early as possible
+            if line[0] in _SKIP_CHARS:
+                continue
+            handler = dispatch.get(line.split(None, 1)[0])
+            if handler is not None:
+                handler(line)
+
+    msg = pd.DataFrame({'timestamp': _to_column(msg_time, 'int64'),
+                        'text': msg_text})
+
+    return {'efix': _to_frame(efix, EFIX_COLS),
+            'esac': _to_frame(esac, ESAC_COLS),
+            'eblink': _to_frame(eblink, EBLINK_COLS),
+            'msg': msg}
+
+
+class SampleBuffer:
+    '''Preallocated NumPy columns for the samples, the buffers double
+    in size when they are full'''
+
+    def __init__(self, capacity=65536, columns=SAMPLE_COLS):
+        '''Initialize
+
+        capacity: number of samples to preallocate
+        columns: a list of (name, dtype) tuples, e.g., SAMPLE_COLS'''
+
+        self._n = 0
+        self._cols = {name: np.empty(capacity, dtype)
+                      for name, dtype in columns}
+
+    def __len__(self):
+        return self._n
+
+    def extend(self, data):
+        '''Append a block of samples
+
+        data: a dict of equal-length arrays, keyed by the column names'''
+
+        n_new = len(next(iter(data.values())))
+        capacity = len(next(iter(self._cols.values())))
+        if self._n + n_new > capacity:
+            # grow the buffers geometrically
+            while self._n + n_new > capacity:
+                capacity *= 2
+            for name, col in self._cols.items():
+                new_col = np.empty(capacity, col.dtype)
+                new_col[:self._n] = col[:self._n]
+                self._cols[name] = new_col
+
+        for name, col in self._cols.items():
+            col[self._n:self._n + n_new] = data[name]
+        self._n += n_new
+
+    def columns(self):
+        '''Return the filled part of the buffers, as a dict of arrays'''
+
+        return {name: col[:self._n] for name, col in self._cols.items()}
+
+
+def _to_number(value, dtype):
+    '''Convert a number string to int or float, '.' becomes NaN'''
+
+    if dtype == 'int64':
+        return int(value)
+
+    return float(value) if value != '.' else np.nan
+
+
+def iter_events(asc, kinds=('EFIX', 'ESACC', 'EBLINK', 'MSG'), eye='R'):
+    '''Stream the events and messages in an ASC file as typed records
+
+    asc: path to the ASC file, or an iterable of lines (e.g., a file)
+    kinds: the events to retrieve, e.g., {'EFIX', 'ESACC'}
+    eye: 'L' or 'R', events from the other eye are skipped;
+         set to None to keep the events from both eyes
+
+    Yield Fixation, Saccade, Blink, and Message records, in file order'''
+
+    def _event(record, columns):
+        '''Create a handler to convert an event line to a record'''
+
+        def _handler(line):
+            tokens = line.split()
+            if eye is None or tokens[1] == eye:
+                values = [_to_number(v, dtype) for v, (_, dtype)
+                          in zip(tokens[2:], columns)]
+                return record(tokens[1], *values)
+        return _handler
+
+    def _message(line):
+        '''Convert a message line to a record'''
+
+        tokens = line.rstrip('\r\n').split(None, 2)
+        return Message(int(tokens[1]), tokens[2] if len(tokens) > 2 else '')
+
+    handlers = {'EFIX': _event(Fixation, EFIX_COLS),
+                'ESACC': _event(Saccade, ESAC_COLS),
+                'EBLINK': _event(Blink, EBLINK_COLS),
+                'MSG': _message}
+    dispatch = {kind: handlers[kind] for kind in kinds}
+
+    with _open_lines(asc) as lines:
+        for line in lines:
+            if line[0] in _SKIP_CHARS:
+                continue
+            handler = dispatch.get(line.split(None, 1)[0])
+            if handler is not None:
+                record = handler(line)
+                if record is not None:
+                    yield record
+
+
+def iter_samples(asc, chunk=100_000):
+    '''Stream the samples in an ASC file as fixed-size NumPy chunks,
+    tracking loss ('.') is converted to NaN
+
+    asc: path to the ASC file, or an iterable of lines (e.g., a file)
+    chunk: number of samples in each chunk (the last one may be shorter)
+
+    Yield dicts of arrays: timestamp (int64), gaze_x, gaze_y, and pupil
+    (float32); for binocular recordings, these are the left-eye data.
+    Sample lines with fewer fields are skipped, as in asc_mmap.py'''
+
+    rows = []
+
+    def _convert():
+        '''Convert the sample fields in rows to typed arrays'''
+
+        data = {name: _to_column(values, dtype) for (name, dtype), values
+                in zip(SAMPLE_COLS, zip(*rows))}
+        rows.clear()
+        return data
+
+    with _open_lines(asc) as lines:
+        for line in lines:
+            # 80855875	   .	   .	    0.0	...
+            if line[0] in _DIGITS:
+                fields = line.split('\t', 4)
+                # skip the (truncated) lines with too few fields
+                if len(fields) < len(SAMPLE_COLS):
+                    continue
+                rows.append(fields[:4])
+                if len(rows) == chunk:
+                    yield _convert()
+    if rows:
+        yield _convert()
+
+
+def load_samples(asc, block_size=65536):
+    '''Load the samples from an ASC file into NumPy columns,
+    tracking loss ('.') is converted to NaN
+
+    asc: path to the ASC file, or an iterable of lines (e.g., a file)
+    block_size: number of sample lines to convert at a time
+
+    Return a dict of arrays, see iter_samples()'''
+
+    buffer = SampleBuffer(block_size)
+    for data in iter_samples(asc, block_size):
+        buffer.extend(data)
+
+    return buffer.columns()
+
+
+def trial_boundaries(msg, start='image_onset', end='image_offset'):
+    '''Get the timestamps of the messages marking the start and end
+    of each trial
+
+    msg: the message data frame, see parse_events()
+    start, end: message text marking the start and end of a trial, or
+                its first word, e.g., 'TRIALID' for 'TRIALID 1'
+
+    Return a pandas data frame with two columns, onset and offset'''
+
+    text = msg['text']
+    is_start = (text == start) | text.str.startswith(start + ' ')
+    is_end = (text == end) | text.str.startswith(end + ' ')
+    onset = msg['timestamp'][is_start].to_numpy()
+    offset = msg['timestamp'][is_end].to_numpy()
+    n_trials = min(len(onset), len(offset))
+
+    return pd.DataFrame({'onset': onset[:n_trials],
+                         'offset': offset[:n_trials]})
+
+
+def screen_size(msg):
+    '''Get the screen resolution from the DISPLAY_COORDS message'''
+
+    # MSG	4302897 DISPLAY_COORDS 0 0 1279 799
+    coords = msg['text'][msg['text'].str.startswith('DISPLAY_COORDS')]
+    left, top, right, bottom = [int(float(v)) for v in
+                                coords.iloc[0].split()[1:5]]
+
+    return right - left + 1, bottom - top + 1
+
+
+def split_trials(samples, trials):
+    '''Split the samples into trials
+
+    samples: a dict of sample columns, see load_samples()
+    trials: the trial onset and offset timestamps, see trial_boundaries()
+
+    Return a dict of pandas data frames, keyed by trial number (from 1)'''
+
+    timestamp = samples['timestamp']
+    first = np.searchsorted(timestamp, trials['onset'], side='left')
+    last = np.searchsorted(timestamp, trials['offset'], side='right')
+
+    trial_DFs = {}
+    for trial, (i, j) in enumerate(zip(first, last), start=1):
+        trial_DFs[trial] = pd.DataFrame({name: col[i:j]
+                                         for name, col in samples.items()})
+
+    return trial_DFs
+
+
+def iter_trials(asc_path, start='image_onset', end='image_offset',
+                chunk=100_000):
+    '''Stream the samples of an ASC file trial by trial; only the
+    samples of the current trial are kept in memory
+
+    asc_path: path to the ASC file
+    start, end: message text marking the start and end of a trial
+    chunk: number of samples to read at a time, see iter_samples()
+
+    Yield (trial number, pandas data frame) tuples, trial number from 1'''
+
+    # A first pass over the messages, which skips the samples
+    msg = pd.DataFrame(iter_events(asc_path, ['MSG']),
+                       columns=Message._fields)
+    trials = trial_boundaries(msg, start, end)
+    onset = trials['onset'].to_numpy()
+    offset = trials['offset'].to_numpy()
+
+    k = 0  # index of the current trial
+    pieces = []
+    for data in iter_samples(asc_path, chunk):
+        timestamp = data['timestamp']
+        while k < len(onset):
+            i = np.searchsorted(timestamp, onset[k], side='left')
+            j = np.searchsorted(timestamp, offset[k], side='right')
+            if j > i:
+                pieces.append({name: col[i:j] for name, col in data.items()})
+            if offset[k] > timestamp[-1]:
+                break  # the trial continues in the next chunk
+            yield k + 1, _concat_frame(pieces)
+            pieces = []
+            k += 1
+
+    # Trials ending after the last sample
+    for k in range(k, len(onset)):
+        yield k + 1, _concat_frame(pieces)
+        pieces = []
+
+
+def _concat_frame(pieces):
+    '''Concatenate chunks of sample columns into a pandas data frame'''
+
+    if not pieces:
+        return pd.DataFrame({name: np.empty(0, dtype)
+                             for name, dtype in SAMPLE_COLS})
+
+    return pd.DataFrame({name: np.concatenate([p[name] for p in pieces])
+                         for name, _ in SAMPLE_COLS})
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+#
+# Filename: batch_convert.py
+# Author: Zhiguo Wang
+# Date: 10/18/2026
+#
+# Description:
+# Convert a folder of EDF files to ASC files and parse them in parallel.
+# For each participant (EDF file), we write a consolidated event table
+# (<name>_events.csv) and a samples store (<name>.npz, the same format
+# as the files in .asc_cache). Files with up-to-date outputs are skipped.
+#
+# Usage:
+#     python batch_convert.py edf_folder output_folder -j 4
+#     python batch_convert.py edf_folder output_folder --edf2asc ./stub.sh
+
+import os
+import sys
+import glob
+import time
+import argparse
+import itertools
+import functools
+import subprocess
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from asc_parser import SAMPLE_COLS, parse_events, trial_boundaries
+from asc_mmap import read_samples
+from asc_cache import save_session
+
+# The event data frames in the event table, labeled as the ASC records
+EVENT_LABELS = {'efix': 'EFIX', 'esac': 'ESACC', 'eblink': 'EBLINK'}
+
+
+def run_edf2asc(edf_path, cmd='edf2asc', options=('-y',), eye=None):
+    '''Convert an EDF file with the edf2asc command-line tool, the ASC
+    file is saved in the same folder as the EDF file
+
+    edf_path: path to the EDF file
+    cmd: the edf2asc executable, or a stub with the same interface
+    options: command-line options, e.g., ('-y',) to overwrite the ASC
+    eye: 'L' or 'R', output the samples of this eye only (option -l or
+         -r), so the samples of binocular recordings match the events
+
+    Return the path to the ASC file'''
+
+    if eye is not None:
+        options = (f'-{eye.lower()}',) + tuple(options)
+    asc_path = os.path.splitext(edf_path)[0] + '.asc'
+    # edf2asc may return a non-zero code even if the conversion succeeded,
+    # so we check that the ASC file was (re)written instead; an older ASC
+    # file left in place means the conversion failed
+    before = os.stat(asc_path).st_mtime_ns \
+        if os.path.exists(asc_path) else None
+    subprocess.run([cmd, *options, edf_path], stdout=subprocess.DEVNULL,
+                   stderr=subprocess.DEVNULL)
+    if not os.path.exists(asc_path) or \
+       os.stat(asc_path).st_mtime_ns == before or \
+       os.path.getmtime(asc_path) < os.path.getmtime(edf_path):
+        raise RuntimeError(f'{cmd} failed to convert {edf_path}')
+
+    return asc_path
+
+
+def sample_columns(asc_path, eye, max_lines=10000):
+    '''The sample fields to read from an ASC file; the left-eye fields
+    come first in binocular recordings, so they are skipped for the right
+    eye (e.g., if the ASC was converted without the -l or -r option)
+
+    Return a list of (name, dtype) tuples, see asc_mmap.read_samples()'''
+
+    with open(asc_path) as f:
+        for line in itertools.islice(f, max_lines):
+            # SAMPLES	GAZE	LEFT	RIGHT	RATE	1000.00 ...
+            if line.startswith('SAMPLES'):
+                tokens = line.split()
+                if eye == 'R' and 'LEFT' in tokens and 'RIGHT' in tokens:
+                    return SAMPLE_COLS[:1] + \
+                        [('left_' + name, dtype)
+                         for name, dtype in SAMPLE_COLS[1:]] + SAMPLE_COLS[1:]
+                break
+
+    return SAMPLE_COLS
+
+
+def _up_to_date(outputs, source):
+    '''Check if all outputs exist and are newer than the source file'''
+
+    src_mtime = os.path.getmtime(source)
+
+    return all(os.path.exists(f) and os.path.getmtime(f) >= src_mtime
+               for f in outputs)
+
+
+def event_table(session):
+    '''Put the fixations, saccades, and blinks into a single data frame,
+    with the event type and trial number (0 if outside a trial)'''
+
+    frames = []
+    for event, label in EVENT_LABELS.items():
+        frame = session[event].copy()
+        frame.insert(0, 'event', label)
+        frames.append(frame)
+    events = pd.concat(frames, ignore_index=True)
+    events = events.sort_values('startT', kind='stable', ignore_index=True)
+
+    # The last trial starting before each event, if the event starts
+    # before the end of that trial
+    onset = session['trials']['onset'].to_numpy()
+    offset = session['trials']['offset'].to_numpy()
+    start_t = events['startT'].to_numpy()
+    idx = np.searchsorted(onset, start_t, side='right') - 1
+    in_trial = (idx >= 0) & (start_t <= offset[np.maximum(idx, 0)])
+    events.insert(1, 'trial', np.where(in_trial, idx + 1, 0))
+
+    return events
+
+
+def process_file(edf_path, out_dir, converter=run_edf2asc, eye='R',
+                 start='image_onset', end='image_offset', force=False):
+    '''Convert and parse a single EDF file, this function runs in the
+    worker processes
+
+    edf_path: path to the EDF file
+    out_dir: the folder to save the event table and samples store
+    converter: a function that converts an EDF file and returns the path
+               to the ASC file, see run_edf2asc()
+    eye: 'L' or 'R', events and samples from the other eye are skipped
+    start, end: message text marking the start and end of a trial
+    force: process the file even if the outputs are up to date
+
+    Return a dict of the status and timing (in seconds) of each step'''
+
+    name = os.path.splitext(os.path.basename(edf_path))[0]
+    events_path = os.path.join(out_dir, f'{name}_events.csv')
+    store_path = os.path.join(out_dir, f'{name}.npz')
+    result = {'file': name, 'status': 'skipped',
+              'convert': 0.0, 'parse': 0.0, 'write': 0.0, 'total': 0.0}
+
+    t_start = time.perf_counter()
+    if not force and _up_to_date([events_path, store_path], edf_path):
+        return result
+
+    try:
+        asc_path = os.path.splitext(edf_path)[0] + '.asc'
+        t0 = time.perf_counter()
+        if force or not _up_to_date([asc_path], edf_path):
+            asc_path = converter(edf_path, eye=eye)
+        result['convert'] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        session = parse_events(asc_path, eye=eye)
+        samples = read_samples(asc_path, sample_columns(asc_path, eye))
+        session['samples'] = {name: samples[name]
+                              for name, _ in SAMPLE_COLS}
+        session['trials'] = trial_boundaries(session['msg'], start, end)
+        result['parse'] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        event_table(session).to_csv(events_path, index=False)
+        save_session(session, store_path,
+                     {'source': os.path.abspath(asc_path), 'eye': eye,
+                      'start': start, 'end': end})
+        result['write'] = time.perf_counter() - t0
+        result['status'] = 'done'
+    except Exception as e:
+        result['status'] = f'failed: {e}'
+    result['total'] = time.perf_counter() - t_start
+
+    return result
+
+
+def run_batch(edf_dir, out_dir, workers=None, converter=run_edf2asc,
+              eye='R', start='image_onset', end='image_offset',
+              force=False):
+    '''Convert and parse all EDF files in a folder across worker processes
+
+    edf_dir: the folder of EDF files
+    out_dir: the folder to save the outputs, created if it does not exist
+    workers: number of worker processes, default to the number of CPUs
+    converter, eye, start, end, force: see process_file()
+
+    Return a pandas data frame of the status and timing of each file'''
+
+    os.makedirs(out_dir, exist_ok=True)
+    edf_files = sorted(f for f in glob.glob(os.path.join(edf_dir, '*'))
+                       if f.lower().endswith('.edf'))
+    job = functools.partial(process_file, out_dir=out_dir,
+                            converter=converter, eye=eye, start=start,
+                            end=end, force=force)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for result in pool.map(job, edf_files):
+            print(f'{result["file"]:>20}: {result["status"]}, '
+                  f'convert {result["convert"]:.2f} s, '
+                  f'parse {result["parse"]:.2f} s, '
+                  f'write {result["write"]:.2f} s, '
+                  f'total {result["total"]:.2f} s')
+            results.append(result)
+
+    return pd.DataFrame(results, columns=['file', 'status', 'convert',
+                                          'parse', 'write', 'total'])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Convert and parse a folder of EDF files')
+    parser.add_argument('edf_dir', help='folder of the EDF files')
+    parser.add_argument('out_dir', help='folder to save the outputs')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='number of worker processes')
+    parser.add_argument('--edf2asc', default='edf2asc',
+                        help='the edf2asc executable (or a stub)')
+    parser.add_argument('--options', default='-y',
+                        help='edf2asc options, e.g., "-r -y"')
+    parser.add_argument('--eye', default='R', choices=['L', 'R'])
+    parser.add_argument('--force', action='store_true',
+                        help='process files with up-to-date outputs')
+    args = parser.parse_args()
+
+    converter = functools.partial(run_edf2asc, cmd=args.edf2asc,
+                                  options=tuple(args.options.split()))
+    t0 = time.perf_counter()
+    timing = run_batch(args.edf_dir, args.out_dir, args.workers, converter,
+                       args.eye, force=args.force)
+    print(f'{len(timing)} files, {(timing.status == "done").sum()} done, '
+          f'{(timing.status == "skipped").sum()} skipped, '
+          f'{time.perf_counter() - t0:.2f} s in total')
+    sys.exit(int(timing.status.str.startswith('failed').any()))
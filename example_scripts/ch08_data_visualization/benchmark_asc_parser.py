@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+#
+# Filename: benchmark_asc_parser.py
+# Author: Zhiguo Wang
+# Date: 10/18/2026
+#
+# Description:
+# Compare the parsing speed (lines per second) of the per-line regular
+# expression loops (the original parse_ASC_re.py and gaze_trace_plot.py)
+# and the asc_parser and asc_mmap modules, on a synthetic ASC file with
+# 1000 Hz samples.
+
+import os
+import re
+import sys
+import time
+import random
+import tempfile
+import numpy as np
+import pandas as pd
+from asc_parser import parse_events, load_samples
+from asc_mmap import read_samples
+
+
+def write_synthetic_asc(asc_path, n_trials=10, trial_dur=60000):
+    '''Write an ASC file with samples, fixations, saccades and messages
+
+    asc_path: path of the ASC file to write
+    n_trials: number of trials
+    trial_dur: duration of each trial, in ms (i.e., samples at 1000 Hz)
+
+    Return the number of lines in the file'''
+
+    rnd = random.Random(0)
+    n_lines = 0
+    t = 1000000
+    with open(asc_path, 'w') as asc:
+        asc.write('MSG\t%d DISPLAY_COORDS 0 0 1279 799\n' % t)
+        n_lines += 1
+        for trial in range(n_trials):
+            asc.write('MSG\t%d TRIALID %d\n' % (t, trial + 1))
+            asc.write('START\t%d \tRIGHT\tSAMPLES\tEVENTS\n' % t)
+            asc.write('MSG\t%d image_onset\n' % t)
+            asc.write('MSG\t%d !V IMGLOAD FILL images/woods.jpg\n' % t)
+            n_lines += 4
+            fix_start = t
+            x, y = 640.0, 400.0
+            for i in range(trial_dur):
+                t += 1
+                if rnd.random() < 0.01:  # tracking loss
+                    asc.write('%d\t   .\t   .\t    0.0\t...\n' % t)
+                else:
+                    x += rnd.uniform(-1, 1)
+                    y += rnd.uniform(-1, 1)
+                    asc.write('%d\t%7.1f\t%7.1f\t%7.1f\t...\n' %
+                              (t, x, y, 1000 + rnd.uniform(-50, 50)))
+                n_lines += 1
+                # a fixation and a saccade every 250 ms
+                if i % 250 == 249:
+                    asc.write('EFIX R   %d\t%d\t%d\t%7.1f\t%7.1f\t%7d\n' %
+                              (fix_start, t, t - fix_start + 1, x, y, 1000))
+                    asc.write('ESACC R  %d\t%d\t%d\t%7.1f\t%7.1f\t%7.1f\t'
+                              '%7.1f\t%7.2f\t%7d\n' %
+                              (t, t + 20, 21, x, y, x + 50, y + 50,
+                               2.5, 180))
+                    n_lines += 2
+                    fix_start = t + 21
+            asc.write('MSG\t%d image_offset\n' % t)
+            asc.write('END\t%d \tSAMPLES\tEVENTS\tRES\t  44.16\t  48.66\n' % t)
+            n_lines += 2
+
+    return n_lines
+
+
+def parse_with_re(asc_path):
+    '''The per-line regular expression loop in the original
+    parse_ASC_re.py'''
+
+    efix = []  # fixation end events
+    esac = []  # saccade end events
+    asc = open(asc_path)
+    for line in asc:
+        # Extract all numbers and put them in a list
+        tmp_data = [float(x) for x in re.findall(r'-?\d+\.?\d*', line)]
+
+        # retrieve events parsed from the right eye recording
+        if re.search('^EFIX R', line):
+            efix.append(tmp_data)
+        elif re.search('^ESACC R', line):
+            esac.append(tmp_data)
+        else:
+            pass
+    asc.close()
+
+    return pd.DataFrame(efix), pd.DataFrame(esac)
+
+
+def parse_with_dispatch(asc_path):
+    '''The dispatch-table parser in asc_parser.py'''
+
+    events = parse_events(asc_path, eye='R')
+
+    return events['efix'], events['esac']
+
+
+def samples_with_re(asc_path):
+    '''The per-line regular expression loop in the original
+    gaze_trace_plot.py'''
+
+    asc = open(asc_path)
+    new_trial = False
+    trial_DFs = {}  # samples from all trials in a tuple
+    trial = 0
+    for line in asc:
+        # Extract numerical values from the data line
+        values = [float(x) for x in re.findall(r'-?\d+\.?\d*', line)]
+
+        # Look for the message marking image onset
+        if re.search('image_onset', line):
+            new_trial = True
+            trial += 1
+            tmp_DF = []
+
+        # A sample data line always starts with a numerical literal
+        if new_trial and re.search(r'^\d', line):
+            if len(values) == 4:  # normal sample line
+                tmp_DF.append(values)
+            else:  # sample line with missing values (e.g., tracking loss)
+                tmp_DF.append([values[0], np.nan, np.nan, np.nan])
+
+        if re.search('image_offset', line):  # message marking image offset
+            colname = ['timestamp', 'gaze_x', 'gaze_y', 'pupil']
+            trial_DFs[trial] = pd.DataFrame(tmp_DF, columns=colname)
+            new_trial = False
+    asc.close()
+
+    return sum(len(df) for df in trial_DFs.values())
+
+
+def samples_with_loader(asc_path):
+    '''The block loader in asc_parser.py'''
+
+    return len(load_samples(asc_path)['timestamp'])
+
+
+def samples_with_mmap(asc_path):
+    '''The memory-mapped reader in asc_mmap.py'''
+
+    return len(read_samples(asc_path)['timestamp'])
+
+
+if __name__ == '__main__':
+    # Number of trials (1-min each) in the synthetic ASC file
+    n_trials = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        asc_path = os.path.join(tmp_dir, 'synthetic.asc')
+        n_lines = write_synthetic_asc(asc_path, n_trials)
+        print(f'{n_lines} lines in the synthetic ASC file')
+
+        print('Events (EFIX, ESACC)')
+        for name, parser in [('regex loop', parse_with_re),
+                             ('dispatch table', parse_with_dispatch)]:
+            t0 = time.perf_counter()
+            efixFRM, esacFRM = parser(asc_path)
+            t = time.perf_counter() - t0
+            print(f'{name:>16}: {t:7.3f} s, {n_lines/t:12,.0f} lines/s, '
+                  f'{len(efixFRM)} EFIX, {len(esacFRM)} ESACC')
+
+        print('Samples (timestamp, gaze_x, gaze_y, pupil)')
+        for name, loader in [('regex loop', samples_with_re),
+                             ('block loader', samples_with_loader),
+                             ('memory map', samples_with_mmap)]:
+            t0 = time.perf_counter()
+            n_samples = loader(asc_path)
+            t = time.perf_counter() - t0
+            print(f'{name:>16}: {t:7.3f} s, {n_lines/t:12,.0f} lines/s, '
+                  f'{n_samples} samples')
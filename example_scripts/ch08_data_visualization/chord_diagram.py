@@ -6,18 +6,35 @@
 #
 # Description:
 # A cord diagram to capture the transitions between interest areas
+#
+# Usage:
+#     python chord_diagram.py              # the example matrix below
+#     python chord_diagram.py data.asc     # transitions in an ASC file
 
+import sys
 import chord
+from asc_parser import parse_events, trial_boundaries
+from ia_transition import ia_measures, chord_matrix
 
-# The co-occurrence matrix
-trans_matrix = [[0, 3, 1, 4, 1],
-                [3, 0, 3, 6, 1],
-                [1, 3, 0, 9, 1],
-                [4, 6, 9, 0, 0],
-                [1, 1, 1, 0, 0]]
+if len(sys.argv) > 1:
+    # Count the transitions between the interest areas defined by the
+    # IAREA messages (see ch05_data_viewer/interest_area.py), over all
+    # trials, i.e., from TRIALID to TRIAL_RESULT
+    events = parse_events(sys.argv[1], eye='R')
+    trials = trial_boundaries(events['msg'], 'TRIALID', 'TRIAL_RESULT')
+    ias = ia_measures(events['efix'], events['msg'], trials)
+    trans_matrix = chord_matrix(ias['transitions'])
+    ia_label = ias['labels']
+else:
+    # The co-occurrence matrix
+    trans_matrix = [[0, 3, 1, 4, 1],
+                    [3, 0, 3, 6, 1],
+                    [1, 3, 0, 9, 1],
+                    [4, 6, 9, 0, 0],
+                    [1, 1, 1, 0, 0]]
 
-# Column and row names for the transition matrix
-ia_label = ['Brother', 'Mother', 'Father', 'Sister', 'Kite']
+    # Column and row names for the transition matrix
+    ia_label = ['Brother', 'Mother', 'Father', 'Sister', 'Kite']
 
 # Create a chord diagram and save it to an HTML file
 chord.Chord(trans_matrix, ia_label).to_html('transition.html')
@@ -8,10 +8,10 @@
 # Extract the samples from an ASC file, then plot a gaze trace plot.
 
 import os
-import re
-import numpy as np
-import pandas as pd
+import sys
+from contextlib import closing
 import matplotlib.pyplot as plt
+from asc_parser import iter_trials
 
 # Convert EDFs to ASC files with the edf2asc command-line tool
 # If you run this script from IDLE on macOS, be sure to launch IDLE
@@ -23,43 +23,27 @@ import matplotlib.pyplot as plt
 cmd = 'edf2asc -r -y freeview/freeview.edf'
 os.system(cmd)
 
-# Open the converted ASC file
-asc = open(os.path.join('freeview', 'freeview.asc'))
-
-new_trial = False
-trial_DFs = {}  # samples from all trials in a tuple
-trial = 0
-for line in asc:
-    # Extract numerical values from the data line
-    values = [float(x) for x in re.findall(r'-?\d+\.?\d*', line)]
-
-    # Look for the message marking image onset
-    if re.search('image_onset', line):
-        new_trial = True
-        trial += 1
+# Stream the samples trial by trial, each trial is a pandas data frame
+# with four columns (timestamp, gaze_x, gaze_y, pupil); tracking loss
+# (e.g., "80855875	   .	   .	    0.0	...") becomes NaN. The trial
+# boundaries come from a first pass over the whole ASC file, which reads
+# the messages and skips the samples; then, only the samples of the
+# current trial are kept in memory, and we stop reading the samples once
+# we have those of the trial to plot; closing() closes the ASC file
+# when we stop early
+asc_path = os.path.join('freeview', 'freeview.asc')
+samples = None
+with closing(iter_trials(asc_path, 'image_onset', 'image_offset')) as trials:
+    for trial, data in trials:
         print(f'processing trial # {trial}...')
+        if trial == 1:
+            samples = data
+            break
 
-        # Store samples in lists (timestamp, x, y, pupil size)
-        tmp_DF = []
-
-    # A sample data line always starts with a numerical literal
-    if new_trial and re.search('^\d', line):
-        # 80855874	 1506.4	  269.0	  729.0	...
-        # 80855875	   .	   .	    0.0	...
-        if len(values) == 4:  # normal sample line
-            tmp_DF.append(values)
-        else:  # sample line with missing values (e.g., tracking loss)
-            tmp_DF.append([values[0], np.nan, np.nan, np.nan])
-
-    if re.search('image_offset', line):  # message marking image offset
-        # Put samples in a pandas data frame and store it in trial_DFs
-        colname = ['timestamp', 'gaze_x', 'gaze_y', 'pupil']
-        trial_DFs[trial] = pd.DataFrame(tmp_DF, columns=colname)
-        new_trial = False
-
-# close the ASC file
-asc.close()
+if samples is None:
+    sys.exit(f'{asc_path}: trial # 1 (image_onset - image_offset) '
+             'not found')
 
 # Plot the gaze trace and pupil size data from trial # 1
-trial_DFs[1].plot(y=['gaze_x', 'gaze_y', 'pupil'])
+samples.plot(y=['gaze_x', 'gaze_y', 'pupil'])
 plt.show()
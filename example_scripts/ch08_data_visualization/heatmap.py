@@ -1 +1,161 @@
-#!/usr/bin/env python3## Filename: heatmap_simple.py# Author: Zhiguo Wang# Date: 4/28/2021## Description:# Extract fixations from an ASC file to create a heatmapimport osimport reimport numpy as npfrom PIL import Imagefrom matplotlib import cm# Convert EDFs to ASC files with the edf2asc command-line tool# If you run this script from IDLE on macOS, be sure to launch IDLE# from the command-line (e.g., enter "idle3.6" in the terminal)## Options for the command line “edf2asc” converter#     -e, output event data only#     -res, output resolution data if present#     -y, overwrite ASC file if existscmd = 'edf2asc -e -res -y freeview/freeview.edf'os.system(cmd)# Open the converted ASC fileasc = open('freeview/freeview.asc', 'r')# Transparency for the heatmapalpha = 0.5new_trial = Falsetrial = 0for line in asc:    # Extract all numerical values from the data line    values = [float(x) for x in re.findall(r'-?\d+\.?\d*', line)]    # Get the correct screen resolution from the GAZE_COORDS message    # MSG	4302897 DISPLAY_COORDS 0 0 1279 799    if re.search('DISPLAY_COORDS', line):        scn_w = int(values[-2]) + 1        scn_h = int(values[-1]) + 1    # Look for the message marking image onset    if re.search('image_onset', line):        new_trial = True        trial += 1        print(f'processing trial # {trial}...')        # Initialize the heatmap matrix        w, h = np.meshgrid(np.linspace(0, scn_w, scn_w),                           np.linspace(0, scn_h, scn_h))        heatmap = np.exp(-(w**2 + h**2)) * 0    if new_trial:        if re.search('EFIX', line):            # EFIX R 80790373 80790527 155 855.5 596.0 881 63.60 63.75            start_t, end_t, duration, x, y, peakv, res_x, res_y = values            # add the new fixation to the heatmap            heatmap += duration * np.exp(-(1.0*(w - x)**2/(2*res_x**2) +                                           1.0*(h - y)**2/(2*res_y**2)))        # Path to the background image        # MSG	3558923 !V IMGLOAD FILL images/woods.jpg        if 'IMGLOAD' in line:            bg_image = line.rstrip().split()[-1]    # Look for the message marking image offset, create a heatmap    if re.search('image_offset', line):        # Open the image and resize it to fill up the screen        img = os.path.join('freeview', bg_image)        pic = Image.open(img).convert('RGBA').resize((scn_w, scn_h))        # Apply a colormap (from the colormap library of MatplotLib)        heatmap = np.uint8(cm.jet(heatmap/np.max(heatmap))*255)        # blending        heatmap = Image.fromarray(heatmap)        blended = Image.blend(pic, heatmap, alpha)        # Save the heatmap as a PNG file        blended.save(f'heatmap_trial_{trial}.png', 'PNG')        new_trial = False# Close the ASC fileasc.close()
\ No newline at end of file
+#!/usr/bin/env python3
+#
+# Filename: heatmap.py
+# Author: Zhiguo Wang
+# Date: 4/28/2021
+#
+# Description:
+# Extract fixations from an ASC file to create a heatmap.
+# The fixation durations are binned into a screen-sized histogram, which
+# is smoothed once with a Gaussian filter in the frequency domain, rather
+# than adding a Gaussian kernel for each fixation; fixations from many
+# trials and participants can be added before the heatmap is computed.
+
+import os
+import numpy as np
+from PIL import Image
+from matplotlib import cm
+from asc_parser import screen_size
+from asc_cache import load_session
+
+
+class Heatmap:
+    '''A duration-weighted fixation heatmap at screen resolution'''
+
+    def __init__(self, scn_w, scn_h):
+        '''Initialize
+
+        scn_w, scn_h: screen resolution, see the DISPLAY_COORDS message'''
+
+        self.size = (scn_w, scn_h)
+        self._hist = np.zeros(scn_w * scn_h)
+        # sum of the resolution data (pixels per degree) and weights,
+        # for the default size of the Gaussian filter
+        self._res = np.zeros(2)
+        self._n_res = 0
+
+    def add(self, x, y, duration, res_x=None, res_y=None):
+        '''Add fixations to the heatmap, e.g., from a trial or a participant
+
+        x, y, duration: arrays of the fixation positions and durations
+        res_x, res_y: arrays of the resolution data (pixels per degree),
+                      available in ASC files converted with -res'''
+
+        scn_w, scn_h = self.size
+        x = np.asarray(x, float)
+        y = np.asarray(y, float)
+        duration = np.asarray(duration, float)
+
+        # fixations off the screen or with missing data are dropped
+        valid = (x >= 0) & (x < scn_w) & (y >= 0) & (y < scn_h)
+        idx = y[valid].astype(int) * scn_w + x[valid].astype(int)
+        self._hist += np.bincount(idx, weights=duration[valid],
+                                  minlength=scn_w * scn_h)
+
+        if res_x is not None and res_y is not None:
+            res = np.column_stack((res_x, res_y))[valid]
+            res = res[~np.isnan(res).any(axis=1)]
+            self._res += res.sum(axis=0)
+            self._n_res += len(res)
+
+    def merge(self, other):
+        '''Add the fixations in another heatmap of the same size'''
+
+        self._hist += other._hist
+        self._res += other._res
+        self._n_res += other._n_res
+
+    def density(self, sigma=None):
+        '''Smooth the fixation histogram with a Gaussian filter
+
+        sigma: standard deviation of the filter, in pixels, a scalar or
+               (sigma_x, sigma_y); default to the mean resolution of the
+               fixations, i.e., 1 degree of visual angle, or 40 pixels
+
+        Return a 2-D array of shape (scn_h, scn_w)'''
+
+        if sigma is None:
+            sigma = self._res / self._n_res if self._n_res else 40.0
+        sigma_x, sigma_y = np.broadcast_to(np.asarray(sigma, float), 2)
+
+        scn_w, scn_h = self.size
+        hist = self._hist.reshape(scn_h, scn_w)
+
+        # pad the histogram to avoid wrap-around at the screen edges
+        pad_x = int(np.ceil(3 * sigma_x))
+        pad_y = int(np.ceil(3 * sigma_y))
+        shape = (scn_h + pad_y, scn_w + pad_x)
+
+        # the Fourier transform of a Gaussian is a Gaussian, and the 2-D
+        # filter is the product of two 1-D filters (separable)
+        fy = np.fft.fftfreq(shape[0])
+        fx = np.fft.rfftfreq(shape[1])
+        gy = np.exp(-2 * (np.pi * sigma_y * fy) ** 2)
+        gx = np.exp(-2 * (np.pi * sigma_x * fx) ** 2)
+        spectrum = np.fft.rfft2(hist, shape) * gy[:, None] * gx[None, :]
+
+        return np.fft.irfft2(spectrum, shape)[:scn_h, :scn_w]
+
+    def overlay(self, bg_image, alpha=0.5, sigma=None):
+        '''Blend the heatmap with a background image
+
+        bg_image: path to the image, resized to fill up the screen
+        alpha: transparency of the heatmap
+        sigma: see density()
+
+        Return a PIL image (RGBA)'''
+
+        pic = Image.open(bg_image).convert('RGBA').resize(self.size)
+        heat = self.density(sigma)
+        peak = heat.max()
+        if peak > 0:
+            heat = heat / peak
+
+        # Apply a colormap (from the colormap library of MatplotLib)
+        heat = Image.fromarray(np.uint8(cm.jet(heat) * 255))
+
+        return Image.blend(pic, heat, alpha)
+
+
+if __name__ == '__main__':
+    # Convert EDFs to ASC files with the edf2asc command-line tool
+    # If you run this script from IDLE on macOS, be sure to launch IDLE
+    # from the command-line (e.g., enter "idle3.6" in the terminal)
+    #
+    # Options for the command line “edf2asc” converter
+    #     -e, output event data only
+    #     -res, output resolution data if present
+    #     -y, overwrite ASC file if exists
+    cmd = 'edf2asc -e -res -y freeview/freeview.edf'
+    os.system(cmd)
+
+    # Parse the converted ASC file (or load it from the cache)
+    session = load_session(os.path.join('freeview', 'freeview.asc'))
+    scn_w, scn_h = screen_size(session['msg'])
+    msg = session['msg']
+    efix = session['efix']
+
+    # Transparency for the heatmap
+    alpha = 0.5
+
+    trials = zip(session['trials']['onset'], session['trials']['offset'])
+    for trial, (onset, offset) in enumerate(trials, start=1):
+        print(f'processing trial # {trial}...')
+
+        # Path to the background image
+        # MSG	3558923 !V IMGLOAD FILL images/woods.jpg
+        in_trial = (msg['timestamp'] >= onset) & (msg['timestamp'] <= offset)
+        img_load = msg['text'][in_trial & msg['text'].str.contains('IMGLOAD')]
+        bg_image = img_load.iloc[0].split()[-1]
+
+        # Add the fixations ending within the trial to the heatmap
+        # EFIX R 80790373 80790527 155 855.5 596.0 881 63.60 63.75
+        fix = efix[(efix['endT'] >= onset) & (efix['endT'] <= offset)]
+        heatmap = Heatmap(scn_w, scn_h)
+        heatmap.add(fix['avgX'], fix['avgY'], fix['duration'],
+                    fix.get('resX'), fix.get('resY'))
+
+        # Blend the heatmap with the image and save it as a PNG file
+        img = os.path.join('freeview', bg_image)
+        blended = heatmap.overlay(img, alpha)
+        blended.save(f'heatmap_trial_{trial}.png', 'PNG')
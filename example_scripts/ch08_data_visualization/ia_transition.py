@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+#
+# Filename: ia_transition.py
+# Author: Zhiguo Wang
+# Date: 10/18/2026
+#
+# Description:
+# Compute the dwell time, fixation count, and the transitions between
+# interest areas (IAs), from the parsed fixations and the IAREA messages
+# (see ch05_data_viewer/interest_area.py). The transition matrix can be
+# passed to chord.Chord() directly, see chord_diagram.py.
+
+from collections import namedtuple
+import numpy as np
+
+# An interest area; coords is (left, top, right, bottom) for RECTANGLE
+# and ELLIPSE, and a list of (x, y) vertices for FREEHAND
+InterestArea = namedtuple('InterestArea', ['ia_id', 'shape', 'coords',
+                                           'label'])
+
+
+def parse_iarea(text):
+    '''Parse an IAREA message, return an InterestArea or None if the
+    message is malformed or the shape is not supported
+
+    >>> parse_iarea('!V IAREA RECTANGLE 2 85 85 285 185 body').coords
+    (85.0, 85.0, 285.0, 185.0)
+    >>> parse_iarea('!V IAREA ELLIPSE 1 0 0 100 100 head').label
+    'head'
+    >>> parse_iarea('!V IAREA FREEHAND 3 285,125 385,50 335,125 tail').coords
+    [(285.0, 125.0), (385.0, 50.0), (335.0, 125.0)]
+    >>> parse_iarea('!V IAREA FREEHAND 3 tail') is None
+    True
+    >>> parse_iarea('!V IAREA FREEHAND 3 285,125 385,50,1 335,125') is None
+    True
+    >>> parse_iarea('!V IAREA RECTANGLE 2 85 85 body') is None
+    True
+    >>> parse_iarea('!V IAREA FILE segment.ias') is None
+    True'''
+
+    tokens = text.split()
+    if 'IAREA' not in tokens:
+        return None
+    tokens = tokens[tokens.index('IAREA') + 1:]
+    if len(tokens) < 2:
+        return None
+    shape = tokens[0].upper()
+    # other forms, e.g., "!V IAREA FILE segment.ias", are not supported
+    if shape not in ('RECTANGLE', 'ELLIPSE', 'FREEHAND'):
+        return None
+
+    try:
+        ia_id = int(tokens[1])
+        if shape == 'FREEHAND':
+            vertices = [t for t in tokens[2:] if ',' in t]
+            coords = [tuple(float(v) for v in t.split(','))
+                      for t in vertices]
+            # a polygon takes at least 3 vertices, each an x,y pair
+            if len(coords) < 3 or any(len(v) != 2 for v in coords):
+                return None
+            label = ' '.join(tokens[2 + len(vertices):])
+        else:
+            coords = tuple(float(v) for v in tokens[2:6])
+            label = ' '.join(tokens[6:])
+    except ValueError:
+        return None
+    if shape != 'FREEHAND' and len(coords) < 4:
+        return None
+
+    return InterestArea(ia_id, shape, coords, label or str(ia_id))
+
+
+def _in_polygon(x, y, vertices):
+    '''Ray casting test for all points at once, looping over the edges'''
+
+    inside = np.zeros(len(x), bool)
+    vx, vy = np.asarray(vertices, float).T
+    for x1, y1, x2, y2 in zip(vx, vy, np.roll(vx, -1), np.roll(vy, -1)):
+        crosses = (y1 > y) != (y2 > y)
+        if y1 != y2:
+            x_cross = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+            inside ^= crosses & (x < x_cross)
+
+    return inside
+
+
+def in_iarea(x, y, ia):
+    '''Test if points (x, y) are in an interest area, vectorized
+
+    x, y: arrays of the fixation positions
+    ia: an InterestArea
+
+    Return a boolean array'''
+
+    x = np.asarray(x, float)
+    y = np.asarray(y, float)
+    if ia.shape == 'FREEHAND':
+        return _in_polygon(x, y, ia.coords)
+
+    left, top, right, bottom = ia.coords
+    if ia.shape == 'RECTANGLE':
+        return (x >= left) & (x <= right) & (y >= top) & (y <= bottom)
+
+    # ELLIPSE, defined by its bounding box
+    cx, cy = (left + right) / 2.0, (top + bottom) / 2.0
+    a, b = (right - left) / 2.0, (bottom - top) / 2.0
+
+    return ((x - cx) / a) ** 2 + ((y - cy) / b) ** 2 <= 1
+
+
+def assign_iareas(x, y, iareas, labels):
+    '''Find the interest area of each fixation
+
+    x, y: arrays of the fixation positions
+    iareas: a list of InterestArea; if the IAs overlap, the one defined
+            first wins
+    labels: a list of all IA labels, the returned index points to it
+
+    Return an int array of label indices, -1 if not in any IA'''
+
+    hit = np.full(len(x), -1)
+    for ia in reversed(iareas):
+        hit[in_iarea(x, y, ia)] = labels.index(ia.label)
+
+    return hit
+
+
+def ia_measures(efix, msg, trials, self_transitions=False):
+    '''Compute the IA dwell times, fixation counts, and first-order
+    transitions, pooled over the trials
+
+    efix: the fixation data frame, see asc_parser.parse_events()
+    msg: the message data frame, see asc_parser.parse_events()
+    trials: the trial onset and offset timestamps, see
+            asc_parser.trial_boundaries(); the IAREA messages within
+            each trial define the IAs of that trial
+    self_transitions: count consecutive fixations in the same IA
+
+    Return a dict: 'labels' (IA labels), 'dwell_time', 'fix_count'
+    (arrays, one value per IA), and 'transitions' (a 2-D array, from
+    row to column)'''
+
+    is_ia = msg['text'].str.contains('IAREA', regex=False)
+    ia_time = msg['timestamp'][is_ia].to_numpy()
+    ia_text = msg['text'][is_ia].tolist()
+    fix_end = efix['endT'].to_numpy()
+    fix_x = efix['avgX'].to_numpy()
+    fix_y = efix['avgY'].to_numpy()
+    fix_dur = efix['duration'].to_numpy()
+
+    labels = []
+    hits = []
+    durations = []
+    src = []
+    dst = []
+    for onset, offset in zip(trials['onset'], trials['offset']):
+        i = np.searchsorted(ia_time, onset, side='left')
+        j = np.searchsorted(ia_time, offset, side='right')
+        iareas = [ia for ia in map(parse_iarea, ia_text[i:j])
+                  if ia is not None]
+        for ia in iareas:
+            if ia.label not in labels:
+                labels.append(ia.label)
+
+        # Fixations ending within the trial
+        i = np.searchsorted(fix_end, onset, side='left')
+        j = np.searchsorted(fix_end, offset, side='right')
+        hit = assign_iareas(fix_x[i:j], fix_y[i:j], iareas, labels)
+        hits.append(hit)
+        durations.append(fix_dur[i:j])
+
+        # Transitions between consecutive fixations in IAs
+        in_ia = hit[hit >= 0]
+        if not self_transitions:
+            # merge consecutive fixations in the same IA (a dwell)
+            keep = np.ones(len(in_ia), bool)
+            keep[1:] = in_ia[1:] != in_ia[:-1]
+            in_ia = in_ia[keep]
+        src.append(in_ia[:-1])
+        dst.append(in_ia[1:])
+
+    n_ia = len(labels)
+    hit = np.concatenate(hits) if hits else np.empty(0, int)
+    duration = np.concatenate(durations) if durations else np.empty(0)
+    in_ia = hit >= 0
+
+    transitions = np.zeros((n_ia, n_ia), int)
+    if src:
+        np.add.at(transitions, (np.concatenate(src), np.concatenate(dst)),
+                  1)
+
+    return {'labels': labels,
+            'dwell_time': np.bincount(hit[in_ia], weights=duration[in_ia],
+                                      minlength=n_ia),
+            'fix_count': np.bincount(hit[in_ia], minlength=n_ia),
+            'transitions': transitions}
+
+
+def chord_matrix(transitions):
+    '''Convert a transition matrix into the symmetric co-occurrence
+    matrix (a list of lists) that chord.Chord() takes'''
+
+    transitions = np.asarray(transitions)
+    matrix = transitions + transitions.T
+    np.fill_diagonal(matrix, 0)
+
+    return matrix.tolist()
@@ -62,9 +62,11 @@ for line in asc:
         draw.line(fix_coords, fill=(0, 0, 255), width=2)
 
         # Draw circles to represent the fixations, the diameter reflects
-        # the fixation duration, scaled to its maximum
+        # the fixation duration, scaled to its maximum (see
+        # scanpath_batch.py for rendering all trials in parallel)
+        max_duration = max(fix_duration)
         for i, d in enumerate(fix_duration):
-            sz = sqrt(d / max(fix_duration) * 256)
+            sz = sqrt(d / max_duration * 256)
             gx, gy = fix_coords[i]
             draw.ellipse([gx-sz, gy-sz, gx+sz, gy+sz],
                          fill=(255, 255, 0), outline=(0, 0, 255))
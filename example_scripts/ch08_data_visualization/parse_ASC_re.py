@@ -5,37 +5,30 @@
 # Date: 5/25/2021
 #
 # Description:
-# Parse the ASC file with regular expressions (re).
+# Parse the ASC file to extract the fixation and saccade end events.
+# The events are streamed by asc_parser.iter_events(), which only
+# tokenizes the event lines, see benchmark_asc_parser.py for a
+# comparison with a per-line regular expression (re) search.
 
 import os
-import re
 import pandas as pd
-
-# Open the converted ASC file
-asc = open(os.path.join('freeview', 'freeview.asc'))
+from asc_parser import iter_events, Fixation, Saccade
 
 efix = []  # fixation end events
 esac = []  # saccade end events
-for line in asc:
-    # Extract all numbers and put them in a list
-    tmp_data = [float(x) for x in re.findall(r'-?\d+\.?\d*', line)]
-
-    # retrieve events parsed from the right eye recording
-    if re.search('^EFIX R', line):
-        efix.append(tmp_data)
-    elif re.search('^ESACC R', line):
-        esac.append(tmp_data)
+# Retrieve events parsed from the right eye recording
+asc_path = os.path.join('freeview', 'freeview.asc')
+for ev in iter_events(asc_path, kinds={'EFIX', 'ESACC'}, eye='R'):
+    if isinstance(ev, Fixation):
+        efix.append(ev)
     else:
-        pass
+        esac.append(ev)
 
 # Put the extracted data into pandas data frames
 # EFIX R 80790054 80790349 296 981.3 554.5 936
-efix_colname = ['startT', 'endT', 'duration', 'avgX', 'avgY', 'avgPupil']
-efixFRM = pd.DataFrame(efix, columns=efix_colname)
+# columns: eye, startT, endT, duration, avgX, avgY, avgPupil, resX, resY
+efixFRM = pd.DataFrame(efix, columns=Fixation._fields)
 # ESACC R 80790350 80790372 23 982.6 551.8 864.9 587.9 1.94 151
-esac_colname = ['startT', 'endT', 'duration', 'startX', 'startY',
-                'endX', 'endY', 'amplitude', 'peakVel']
-esacFRM = pd.DataFrame(esac, columns=esac_colname)
-
-# Close the ASC file
-asc.close()
+# columns: eye, startT, endT, duration, startX, startY, endX, endY,
+# amplitude, peakVel, resX, resY
+esacFRM = pd.DataFrame(esac, columns=Saccade._fields)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+#
+# Filename: scanpath_batch.py
+# Author: Zhiguo Wang
+# Date: 10/18/2026
+#
+# Description:
+# Render the scanpath of all trials in an ASC file across worker
+# processes. Each worker keeps an LRU cache of the decoded and resized
+# background images, and an optional contact sheet shows all trials.
+#
+# Usage:
+#     python scanpath_batch.py freeview/freeview.asc -o scanpaths -j 4
+#     python scanpath_batch.py freeview/freeview.asc --contact-sheet
+
+import os
+import math
+import argparse
+import functools
+import numpy as np
+from PIL import Image, ImageDraw
+from concurrent.futures import ProcessPoolExecutor
+from asc_parser import screen_size
+from asc_cache import load_session
+
+# Size of the trial thumbnails on the contact sheet
+THUMB_SIZE = (320, 200)
+
+
+@functools.lru_cache(maxsize=8)
+def load_background(img_path, size):
+    '''Open an image and resize it to fill up the screen; the decoded
+    images are cached, keyed by (path, size)
+
+    Return a PIL image, which should be copied before drawing on it'''
+
+    return Image.open(img_path).convert('RGB').resize(size)
+
+
+def trial_jobs(session, img_root, out_dir):
+    '''Collect the data needed to render each trial
+
+    session: a parsed ASC file, see asc_cache.load_session()
+    img_root: the folder that the IMGLOAD paths are relative to
+    out_dir: the folder to save the scanpath images
+
+    Return a list of dicts, one for each trial'''
+
+    msg = session['msg']
+    size = screen_size(msg)
+    efix = session['efix']
+    fix_end = efix['endT'].to_numpy()
+    fix_x = efix['avgX'].to_numpy()
+    fix_y = efix['avgY'].to_numpy()
+    fix_dur = efix['duration'].to_numpy()
+
+    jobs = []
+    for trial, (onset, offset) in enumerate(zip(session['trials']['onset'],
+                                                session['trials']['offset']),
+                                            start=1):
+        # Path to the background image
+        # MSG	3558923 !V IMGLOAD FILL images/woods.jpg
+        in_trial = (msg['timestamp'] >= onset) & (msg['timestamp'] <= offset)
+        img_load = msg['text'][in_trial & msg['text'].str.contains('IMGLOAD')]
+        bg_image = img_load.iloc[0].split()[-1] if len(img_load) else None
+
+        # Fixations ending within the trial
+        i = np.searchsorted(fix_end, onset, side='left')
+        j = np.searchsorted(fix_end, offset, side='right')
+        jobs.append({'trial': trial, 'size': size,
+                     'bg_image': None if bg_image is None else
+                     os.path.join(img_root, bg_image),
+                     'x': fix_x[i:j], 'y': fix_y[i:j],
+                     'duration': fix_dur[i:j],
+                     'out_path': os.path.join(out_dir,
+                                              f'scanpath_trial_{trial}.png')})
+
+    return jobs
+
+
+def render_trial(job):
+    '''Draw the scanpath of a trial, this function runs in the workers
+
+    job: a dict returned by trial_jobs()
+
+    Return the trial number and a thumbnail of the scanpath'''
+
+    if job['bg_image'] is None:
+        pic = Image.new('RGB', job['size'], (128, 128, 128))
+    else:
+        pic = load_background(job['bg_image'], job['size']).copy()
+    draw = ImageDraw.Draw(pic)
+
+    x = job['x']
+    y = job['y']
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x = x[valid].astype(int)
+    y = y[valid].astype(int)
+    duration = job['duration'][valid]
+
+    if len(duration) > 0:
+        # Draw the scanpath
+        draw.line(list(zip(x.tolist(), y.tolist())), fill=(0, 0, 255),
+                  width=2)
+
+        # The diameter of the circles reflects the fixation duration,
+        # scaled to its maximum; all radii are computed at once
+        radius = np.sqrt(duration / duration.max() * 256)
+        boxes = np.column_stack((x - radius, y - radius,
+                                 x + radius, y + radius))
+        for box in boxes.tolist():
+            draw.ellipse(box, fill=(255, 255, 0), outline=(0, 0, 255))
+
+    pic.save(job['out_path'], 'PNG')
+    pic.thumbnail(THUMB_SIZE)
+
+    return job['trial'], pic
+
+
+def contact_sheet(thumbs, columns=6):
+    '''Tile the trial thumbnails into a single image
+
+    thumbs: a list of (trial, PIL image) tuples'''
+
+    columns = max(1, min(columns, len(thumbs)))
+    rows = math.ceil(len(thumbs) / columns)
+    w, h = THUMB_SIZE
+    sheet = Image.new('RGB', (w * columns, h * rows), (255, 255, 255))
+    draw = ImageDraw.Draw(sheet)
+    for k, (trial, thumb) in enumerate(thumbs):
+        left, top = (k % columns) * w, (k // columns) * h
+        sheet.paste(thumb, (left, top))
+        draw.text((left + 4, top + 4), f'trial {trial}', fill=(255, 0, 0))
+
+    return sheet
+
+
+def render_all(asc_path, out_dir='.', img_root=None, workers=None,
+               sheet=False):
+    '''Render the scanpath of all trials in an ASC file
+
+    asc_path: path to the ASC file
+    out_dir: the folder to save the scanpath images
+    img_root: the folder that the IMGLOAD paths are relative to,
+              default to the folder of the ASC file
+    workers: number of worker processes, default to the number of CPUs
+    sheet: save a contact sheet of all trials (contact_sheet.png)
+
+    Return a list of (trial, thumbnail) tuples'''
+
+    if img_root is None:
+        img_root = os.path.dirname(asc_path)
+    os.makedirs(out_dir, exist_ok=True)
+
+    session = load_session(asc_path)
+    jobs = trial_jobs(session, img_root, out_dir)
+
+    # Trials sharing a background image go to the same worker, so the
+    # image is decoded and resized only once in that worker
+    n_workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (n_workers * 4))
+    jobs.sort(key=lambda job: str(job['bg_image']))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        thumbs = sorted(pool.map(render_trial, jobs, chunksize=chunksize),
+                        key=lambda t: t[0])
+
+    if sheet:
+        contact_sheet(thumbs).save(os.path.join(out_dir,
+                                                'contact_sheet.png'))
+
+    return thumbs
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Render the scanpath of all trials in an ASC file')
+    parser.add_argument('asc_path', help='path to the ASC file')
+    parser.add_argument('-o', '--out-dir', default='.',
+                        help='folder to save the scanpath images')
+    parser.add_argument('--img-root', default=None,
+                        help='folder that the IMGLOAD paths are relative to')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='number of worker processes')
+    parser.add_argument('--contact-sheet', action='store_true',
+                        help='save a contact sheet of all trials')
+    args = parser.parse_args()
+
+    thumbs = render_all(args.asc_path, args.out_dir, args.img_root,
+                        args.workers, args.contact_sheet)
+    print(f'{len(thumbs)} scanpaths saved to {args.out_dir}')
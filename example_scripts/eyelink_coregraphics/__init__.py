@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+#
+# Filename: __init__.py
+# Author: Zhiguo Wang
+# Date: 10/18/2026
+#
+# Description:
+# EyeLink coregraphics libraries (calibration routines) shared by the
+# example scripts. Install it once with "pip install -e example_scripts",
+# then, in an experiment script,
+#
+#     from eyelink_coregraphics import EyeLinkCoreGraphicsPsychoPy
+#
+# The libraries are imported on first access, so a PsychoPy experiment
+# does not need the other graphics libraries to be installed; in a Pygame
+# experiment, import EyeLinkCoreGraphicsPygame instead.
+
+import importlib
+
+# The graphics libraries and the modules implementing them
+_LIBRARIES = {'EyeLinkCoreGraphicsPsychoPy': 'psychopy_display',
+              'EyeLinkCoreGraphicsPygame': 'pygame_display'}
+
+__all__ = list(_LIBRARIES)
+
+
+def __getattr__(name):
+    if name in _LIBRARIES:
+        module = importlib.import_module('.' + _LIBRARIES[name], __name__)
+        return getattr(module, name)
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
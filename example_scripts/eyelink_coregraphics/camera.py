@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+#
+# Filename: camera.py
+# Author: Zhiguo Wang
+# Date: 10/18/2026
+#
+# Description:
+# The camera image the host sends line by line during tracker setup. Each
+# line of palette indices is copied into a buffer, and the whole image is
+# mapped to RGB colors with the palette lookup table once it is complete.
+
+import numpy as np
+
+
+class CameraImage:
+    '''A camera image buffer and its color palette'''
+
+    def __init__(self):
+        # the palette, a lookup table that maps the palette indices to
+        # RGB colors
+        self.palette = np.zeros((256, 3), np.uint8)
+        # the palette indices and the colors of the pixels, allocated
+        # when the size of the camera image is known; the indices are
+        # stored as intp, so np.take() uses them without a converted copy
+        self.indices = None
+        self.rgb = None
+
+    @property
+    def size(self):
+        '''Size (width, height) of the camera image'''
+
+        return (0, 0) if self.indices is None else self.indices.shape[::-1]
+
+    def set_palette(self, r, g, b):
+        '''Given a set of RGB colors, create the lookup table (256 x 3),
+        e.g., palette[1] is (r[1], g[1], b[1]); indices beyond the
+        palette are shown in black'''
+
+        sz = min(len(r), 256)
+        self.palette = np.zeros((256, 3), np.uint8)
+        self.palette[:sz] = np.column_stack((r[:sz], g[:sz], b[:sz]))
+
+    def add_line(self, width, line, totlines, buff):
+        '''Copy a line of palette indices into the buffer
+
+        width, line, totlines, buff: see draw_image_line(), the line
+        number starts from 1
+
+        Return True if the image is complete'''
+
+        if self.size != (width, totlines):
+            self.indices = np.zeros((totlines, width), np.intp)
+            self.rgb = np.zeros((totlines, width, 3), np.uint8)
+
+        try:
+            # a short (truncated) buffer gives fewer pixels, rather than
+            # an error
+            pixels = np.frombuffer(buff, np.uint8)[:width]
+        except TypeError:
+            # a list of palette indices
+            pixels = np.asarray(buff[:width], np.uint8)
+        row = self.indices[line - 1]
+        row[:len(pixels)] = pixels
+        # the missing pixels of a truncated line take palette index 0
+        row[len(pixels):] = 0
+
+        return line == totlines
+
+    def colors(self):
+        '''Look up the colors of all pixels at once
+
+        Return an array of (height, width, 3), which is reused for the
+        next image'''
+
+        # with mode='raise', np.take() writes into a temporary copy of
+        # out; the indices are below 256, so 'clip' never changes them
+        np.take(self.palette, self.indices, axis=0, out=self.rgb,
+                mode='clip')
+
+        return self.rgb
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+#
+# Filename: display_scale.py
+# Author: Zhiguo Wang
+# Date: 10/18/2026
+#
+# Description:
+# Detect the scale of HiDPI (e.g., Mac retina) displays, i.e., the number
+# of framebuffer pixels per window pixel. The scale is read from the
+# window if the window backend reports its framebuffer size; otherwise it
+# is read from a small config file, in which the scale is cached for each
+# display configuration. On macOS, "system_profiler" is the last resort,
+# run in a background thread so it does not hold up the window setup.
+
+import os
+import json
+import platform
+import threading
+import subprocess
+
+# The config file caching the display scales of this machine
+CONFIG_PATH = os.path.join(os.path.expanduser('~'),
+                           '.eyelink_coregraphics.json')
+
+
+def display_key(win):
+    '''A key for the display configuration, e.g., the machine, the screen
+    and the window size; the cached scale is not used if it changes
+
+    win: a PsychoPy window'''
+
+    w, h = win.size
+
+    return f'{platform.node()}|{getattr(win, "screen", 0)}|{w}x{h}'
+
+
+def framebuffer_ratio(win):
+    '''The ratio of the framebuffer size to the window size, or None if
+    the window backend (pyglet or glfw) does not report it'''
+
+    handle = getattr(win, 'winHandle', None)
+    if handle is None:
+        return None
+
+    try:
+        if hasattr(handle, 'get_framebuffer_size'):
+            # pyglet
+            fb_w, _ = handle.get_framebuffer_size()
+            win_w, _ = handle.get_size()
+        else:
+            import glfw
+            fb_w, _ = glfw.get_framebuffer_size(handle)
+            win_w, _ = glfw.get_window_size(handle)
+    except Exception:
+        return None
+
+    return fb_w / win_w if win_w > 0 else None
+
+
+def cached_scale(key, path=CONFIG_PATH):
+    '''Read the scale of a display configuration from the config file,
+    return None if it is not cached'''
+
+    try:
+        with open(path) as f:
+            return json.load(f).get(key)
+    except (OSError, ValueError):
+        return None
+
+
+def save_scale(key, scale, path=CONFIG_PATH):
+    '''Cache the scale of a display configuration in the config file'''
+
+    try:
+        with open(path) as f:
+            config = json.load(f)
+    except (OSError, ValueError):
+        config = {}
+    if config.get(key) == scale:
+        return
+    config[key] = scale
+
+    # write to a temporary file first, so the config is never half written
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(config, f, indent=1)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def probe_retina():
+    '''Check for a retina display with "system_profiler" (macOS only),
+    the output is captured rather than printed to the console
+
+    Return 2.0 for a retina display, otherwise 1.0'''
+
+    try:
+        out = subprocess.run(['system_profiler', 'SPDisplaysDataType'],
+                             stdout=subprocess.PIPE,
+                             stderr=subprocess.DEVNULL,
+                             universal_newlines=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return 1.0
+
+    return 2.0 if 'Retina' in out else 1.0
+
+
+class DisplayScale:
+    '''The scale of the display that a PsychoPy window is on'''
+
+    def __init__(self, win, path=CONFIG_PATH):
+        '''Initialize, and start the system_profiler probe in a background
+        thread if the scale is neither reported by the window nor cached
+
+        win: a PsychoPy window
+        path: the config file caching the display scales'''
+
+        self.key = display_key(win)
+        self._path = path
+        self._thread = None
+
+        self._scale = framebuffer_ratio(win)
+        if self._scale is None:
+            self._scale = cached_scale(self.key, path)
+        elif self._scale > 0:
+            save_scale(self.key, self._scale, path)
+
+        if self._scale is None:
+            if platform.system() == 'Darwin':
+                self._thread = threading.Thread(target=self._probe,
+                                                daemon=True)
+                self._thread.start()
+            else:
+                self._scale = 1.0
+
+    def _probe(self):
+        '''Run system_profiler and cache the result'''
+
+        scale = probe_retina()
+        save_scale(self.key, scale, self._path)
+        self._scale = scale
+
+    @property
+    def ready(self):
+        '''True if the scale is known, i.e., get() does not wait'''
+
+        return self._thread is None or not self._thread.is_alive()
+
+    def get(self, timeout=None):
+        '''Return the scale, wait for the system_profiler probe if it is
+        still running; 1.0 if it does not finish within the timeout'''
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+        return self._scale if self._scale else 1.0
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+#
+# Filename: overlay.py
+# Author: Zhiguo Wang
+# Date: 10/18/2026
+#
+# Description:
+# The cross hairs and search limits drawn over the camera image. The host
+# sends lines and lozenges in a 192 x 160 coordinate space; we collect
+# them as line segments during a frame, then rasterize all segments at
+# once with NumPy onto a reusable RGBA array.
+
+import numpy as np
+
+# The coordinate space of the overlay graphics sent by the host
+HOST_W, HOST_H = 192, 160
+
+# Number of line segments approximating half a circle (lozenge ends)
+ARC_SEGMENTS = 16
+
+
+class CameraOverlay:
+    '''An RGBA layer for the cross hairs, the same size as the camera
+    image'''
+
+    def __init__(self):
+        self.rgba = None
+        self._scale = (1.0, 1.0)
+        self._segments = []
+        self._colors = []
+        # the pixels drawn in the last frame (indices into the flattened
+        # image) and their colors
+        self._pixels = np.empty(0, int)
+        self._pixel_colors = np.empty((0, 4), np.uint8)
+        # the cosine and sine of the angles along half a circle
+        angles = np.linspace(0, np.pi, ARC_SEGMENTS + 1)
+        self._half_circle = np.column_stack((np.cos(angles), np.sin(angles)))
+
+    @property
+    def size(self):
+        '''Size (width, height) of the overlay'''
+
+        return (0, 0) if self.rgba is None else self.rgba.shape[1::-1]
+
+    def resize(self, width, height):
+        '''Allocate the RGBA array and cache the factors that scale the
+        host coordinates to the camera image, if the size has changed'''
+
+        if self.size != (width, height):
+            self.rgba = np.zeros((height, width, 4), np.uint8)
+            self._scale = (width / HOST_W, height / HOST_H)
+            self._pixels = np.empty(0, int)
+
+    def line(self, x1, y1, x2, y2, color):
+        '''Add a line, in host coordinates'''
+
+        sx, sy = self._scale
+        x1, x2 = int(x1 * sx), int(x2 * sx)
+        y1, y2 = int(y1 * sy), int(y2 * sy)
+
+        if min(x1, x2, y1, y2) >= 0:
+            self._segments.append((x1, y1, x2, y2))
+            self._colors.append(color)
+
+    def lozenge(self, x, y, width, height, color):
+        '''Add a lozenge (a rectangle with round ends) showing the search
+        limits, (x, y) is the top-left corner, in host coordinates'''
+
+        sx, sy = self._scale
+        x, y = int(x * sx), int(y * sy)
+        width, height = int(width * sx), int(height * sy)
+
+        if width > height:
+            rad = int(height / 2.)
+            if rad == 0:
+                return
+            lines = [(x + rad, y, x + width - rad, y),
+                     (x + rad, y + height, x + width - rad, y + height)]
+            # the left and right ends, in image coordinates (y down)
+            arcs = [(x + rad, y + rad, 0.5 * np.pi),
+                    (x + width - rad, y + rad, -0.5 * np.pi)]
+        else:
+            rad = int(width / 2.)
+            if rad == 0:
+                return
+            lines = [(x, y + rad, x, y + height - rad),
+                     (x + width, y + rad, x + width, y + height - rad)]
+            # the top and bottom ends
+            arcs = [(x + rad, y + rad, np.pi),
+                    (x + rad, y + height - rad, 0.0)]
+
+        for cx, cy, start in arcs:
+            c, s = np.cos(start), np.sin(start)
+            # rotate the half circle to start at the given angle
+            px = cx + rad * (self._half_circle[:, 0] * c -
+                             self._half_circle[:, 1] * s)
+            py = cy + rad * (self._half_circle[:, 0] * s +
+                             self._half_circle[:, 1] * c)
+            lines.extend(np.column_stack((px[:-1], py[:-1],
+                                          px[1:], py[1:])).tolist())
+
+        self._segments.extend(lines)
+        self._colors.extend([color] * len(lines))
+
+    def rasterize(self):
+        '''Draw all the segments added since the last call onto the RGBA
+        array, which is cleared first'''
+
+        # each RGBA pixel as a 32-bit number, so a pixel takes one write
+        h, w = self.rgba.shape[:2]
+        rgba = self.rgba.view(np.uint32).reshape(-1)
+        rgba[self._pixels] = 0
+        if not self._segments:
+            self._pixels = np.empty(0, int)
+            self._pixel_colors = np.empty((0, 4), np.uint8)
+            return
+
+        seg = np.rint(np.array(self._segments, float))
+        colors = np.full((len(self._colors), 4), 255, np.uint8)
+        colors[:, :3] = self._colors
+        self._segments = []
+        self._colors = []
+
+        # sample each segment at every pixel along its longer axis
+        x1, y1, x2, y2 = seg.T
+        dx, dy = x2 - x1, y2 - y1
+        steps = np.maximum(np.abs(dx), np.abs(dy)).astype(int) + 1
+        idx = np.repeat(np.arange(len(seg)), steps)
+        pos = np.arange(len(idx)) - np.repeat(np.cumsum(steps) - steps, steps)
+        frac = pos / np.maximum(steps - 1, 1)[idx]
+        xs = np.rint(x1[idx] + dx[idx] * frac).astype(int)
+        ys = np.rint(y1[idx] + dy[idx] * frac).astype(int)
+
+        # drop the pixels outside of the camera image
+        inside = (xs >= 0) & (xs < w) & (ys >= 0) & (ys < h)
+        self._pixels = ys[inside] * w + xs[inside]
+        self._pixel_colors = colors[idx[inside]]
+        rgba[self._pixels] = self._pixel_colors.view(np.uint32).reshape(-1)
+
+    def paste(self, rgb):
+        '''Copy the overlay pixels drawn by rasterize() onto an RGB image
+        (a contiguous array of the same size)'''
+
+        rgb.reshape(-1, 3)[self._pixels] = self._pixel_colors[:, :3]
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+#
+# Filename: polling.py
+# Author: Zhiguo Wang
+# Date: 10/18/2026
+#
+# Description:
+# Key modifiers and call statistics shared by the calibration displays.
+# The host polls the keyboard and mouse continuously during tracker setup,
+# so we count these calls and the time spent in them.
+
+import itertools
+
+# The pylink bitmask for each combination of the (alt, ctrl, shift) key
+# modifiers; only one modifier is passed to the tracker, alt first
+MOD_MASKS = {(alt, ctrl, shift): 256 if alt else 64 if ctrl else
+             1 if shift else 0
+             for alt, ctrl, shift in itertools.product([False, True],
+                                                       repeat=3)}
+
+
+class PollStats:
+    '''Count the calls to a method that the host polls, e.g.,
+    get_input_key(), and the time spent in these calls'''
+
+    def __init__(self):
+        self.calls = 0
+        self.busy = 0.0
+        self.first = None
+        self.last = None
+
+    def add(self, t_start, t_end):
+        '''Add a call, which started and ended at t_start and t_end'''
+
+        if self.first is None:
+            self.first = t_start
+        self.last = t_end
+        self.calls += 1
+        self.busy += t_end - t_start
+
+    def report(self):
+        '''Return the number of calls, the poll rate (calls per second),
+        and the mean time per call (in microseconds)'''
+
+        span = self.last - self.first if self.calls > 1 else 0.0
+        rate = (self.calls - 1) / span if span > 0 else 0.0
+        cost = self.busy / self.calls * 1e6 if self.calls else 0.0
+
+        return {'calls': self.calls, 'rate': rate, 'cost': cost}
+
+
+def poll_report(poll_stats):
+    '''Summarize the call statistics, one line per method
+
+    poll_stats: a dict of PollStats, keyed by the method names'''
+
+    lines = []
+    for name, stats in poll_stats.items():
+        r = stats.report()
+        lines.append(f'{name}: {r["calls"]} calls, '
+                     f'{r["rate"]:.1f} calls/s, {r["cost"]:.1f} us/call')
+
+    return '\n'.join(lines)
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+#
+# Filename: psychopy_display.py
+# Author: Zhiguo Wang
+# Date: 2/4/2021
+#
+# Description:
+# An EyeLink coregraphics library (calibration routine)
+# for PsychoPy experiments.
+#
+# psychopy.sound is imported when the beeps are first used, so it does
+# not slow down the start of an experiment.
+
+import os
+import string
+import time
+import importlib
+import collections
+import pylink
+import numpy as np
+from psychopy import visual, event, core
+from .camera import CameraImage
+from .display_scale import DisplayScale
+from .overlay import CameraOverlay
+from .polling import MOD_MASKS, PollStats, poll_report
+
+# The folder of the beep sounds (type.wav, error.wav, qbeep.wav)
+SOUND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# PsychoPy key names and the corresponding pylink key codes, other keys
+# are passed to the tracker as 0
+KEY_TABLE = {'f1': pylink.F1_KEY, 'f2': pylink.F2_KEY, 'f3': pylink.F3_KEY,
+             'f4': pylink.F4_KEY, 'f5': pylink.F5_KEY, 'f6': pylink.F6_KEY,
+             'f7': pylink.F7_KEY, 'f8': pylink.F8_KEY, 'f9': pylink.F9_KEY,
+             'f10': pylink.F10_KEY,
+             'pageup': pylink.PAGE_UP, 'pagedown': pylink.PAGE_DOWN,
+             'up': pylink.CURS_UP, 'down': pylink.CURS_DOWN,
+             'left': pylink.CURS_LEFT, 'right': pylink.CURS_RIGHT,
+             'backspace': ord('\b'), 'return': pylink.ENTER_KEY,
+             'space': ord(' '), 'escape': 27, 'tab': ord('\t'),
+             # plus & minus signs for CR adjustment
+             'num_add': ord('+'), 'equal': ord('+'),
+             'num_subtract': ord('-'), 'minus': ord('-')}
+KEY_TABLE.update((c, ord(c)) for c in string.ascii_letters)
+
+# Number of Sound objects (voices) for each beep, so a beep can start while
+# the previous one of the same kind is still playing
+BEEP_VOICES = 2
+
+# Time (in seconds) an erased target stays on the screen, waiting for the
+# next target to replace it with a single flip
+ERASE_DELAY = 0.1
+
+_modules = {}
+
+
+def ring_mask(inner, res=128):
+    '''A ring-shaped mask for a GratingStim, 1 inside the ring and -1
+    elsewhere
+
+    inner: radius of the hole, relative to the outer radius
+    res: size of the mask (res x res), must be a power of 2'''
+
+    xy = (np.arange(res) + 0.5) / res * 2 - 1
+    r = np.hypot(xy[:, None], xy[None, :])
+
+    return np.where((r >= inner) & (r <= 1), 1.0, -1.0)
+
+
+def _import(name):
+    '''Import a module on first use, e.g., _import('psychopy.sound')'''
+
+    module = _modules.get(name)
+    if module is None:
+        module = _modules[name] = importlib.import_module(name)
+
+    return module
+
+
+class EyeLinkCoreGraphicsPsychoPy(pylink.EyeLinkCustomDisplay):
+    def __init__(self, tracker, win, beep_wait=0.0, beep_gap=0.0):
+        '''Initialize
+
+        tracker: an EyeLink instance (connection)
+        win: the PsychoPy window we use for calibration
+        beep_wait: time to wait (in seconds) after each beep, 0.4 in the
+                   previous versions; by default play_beep() returns
+                   immediately
+        beep_gap: minimum time (in seconds) between two beeps of the same
+                  kind, a beep within this time after the previous one
+                  of its kind is skipped; other kinds are always played'''
+
+        pylink.EyeLinkCustomDisplay.__init__(self)
+
+        # background and target color
+        self._backgroundColor = win.color
+        self._foregroundColor = 'black'
+
+        # window to use for calibration
+        self._display = win
+        # make the mouse cursor invisible
+        self._display.mouseVisible = False
+
+        # display width & height
+        self._w, self._h = win.size
+        # the window size (in pixels), for mouse position scaling
+        self._win_size = tuple(win.size)
+
+        # resolution fix for Mac retina displays; if the display scale is
+        # not known yet, it is applied when the calibration display is
+        # set up, see display_scale.py
+        self._display_scale = DisplayScale(win)
+        self._scale = self._display_scale.get(timeout=0)
+        self._w = int(self._w / self._scale)
+        self._h = int(self._h / self._scale)
+
+        # store camera image pixels (palette indices) and the color
+        # palette for camera image drawing, see camera.py
+        self._camera = CameraImage()
+
+        # initial size of the camera image
+        self._size = (384, 320)
+
+        # initial mouse configuration
+        self._mouse = event.Mouse(False)
+        self.last_mouse_state = -1
+
+        # the number and cost of the calls that the host polls, and of
+        # the camera frames (from the last line to the flip)
+        self.poll_stats = {'get_input_key': PollStats(),
+                           'get_mouse_state': PollStats(),
+                           'camera_frame': PollStats()}
+
+        # camera image title
+        self._msgHeight = self._size[1]/16.0
+        self._title = visual.TextStim(self._display, '',
+                                      wrapWidth=self._w,
+                                      color=self._foregroundColor)
+
+        # calibration target, a ring (a circle of targetSize drawn with a
+        # line of targetSize/2) rendered once into the mask of a stimulus,
+        # so drawing the target at a new position takes a single texture
+        self._targetSize = self._w/64.
+        self._tar = visual.GratingStim(self._display, tex=None,
+                                       mask=ring_mask(1/3.),
+                                       size=self._targetSize*1.5,
+                                       color=self._foregroundColor)
+
+        # the target positions and the flip time (see core.getTime()) of
+        # their onset, for measuring the calibration latency
+        self.target_onsets = []
+
+        # the time erase_cal_target() was called, if the erase is not
+        # shown yet, see erase_cal_target()
+        self._erase_time = None
+
+        # calibration sounds (beeps), loaded when the calibration display
+        # is first set up
+        self._beeps = None
+        self._beep_wait = beep_wait
+        self._beep_gap = beep_gap
+        # the time of the last beep of each kind (beep ID)
+        self._last_beep = {}
+
+        # a reference to the tracker connection
+        self._tracker = tracker
+
+        # the camera image, a stimulus that is created once and whose
+        # texture is updated for each frame; for a clearer view we always
+        # enlarge the camera image (2x)
+        self._cam_img = None
+        self._cam_size = None
+        # the texture of the camera image, a float array (-1 to 1, bottom
+        # row first) that PsychoPy takes without a PIL image; it is
+        # reused for all frames of the same size
+        self._cam_tex = None
+
+        # a transparent layer for the cross hairs; the lines and lozenges
+        # sent by the host are collected for each frame, and drawn at once
+        self._overlay = CameraOverlay()
+
+    def setup_cal_display(self):
+        '''Set up the calibration display '''
+
+        if self._beeps is None:
+            self._load_beeps()
+        if self._scale != self._display_scale.get():
+            self._set_scale(self._display_scale.get())
+        self._display.clearBuffer()
+
+    def _set_scale(self, scale):
+        '''Update the display width & height, and the size of the
+        calibration target and title, for a new display scale'''
+
+        self._scale = scale
+        w, h = self._display.size
+        self._w = int(w / scale)
+        self._h = int(h / scale)
+        self._targetSize = self._w/64.
+        self._tar.size = self._targetSize*1.5
+        self._title.wrapWidth = self._w
+
+    def clear_cal_display(self):
+        '''Clear the calibration display'''
+
+        self._erase_time = None
+        self._display.color = self._backgroundColor
+        self._display.flip()
+
+    def exit_cal_display(self):
+        '''Exit the calibration/validation routine'''
+
+        self.clear_cal_display()
+
+    def record_abort_hide(self):
+        '''This function is called if aborted'''
+
+        pass
+
+    def erase_cal_target(self):
+        '''Erase the target; the host erases the target right before it
+        draws the next one, so the erase is not shown by itself, the
+        flip in draw_cal_target() shows the next target in place of the
+        previous one. If no target follows within ERASE_DELAY, the erase
+        is shown when the keyboard is polled, see get_input_key()'''
+
+        self._erase_time = core.getTime()
+
+    def draw_cal_target(self, x, y):
+        '''Draw the target, the window is cleared by the previous flip,
+        so the target shows up with a single flip'''
+
+        # target position
+        xVis = (x - self._w/2.0)
+        yVis = (self._h/2.0 - y)
+
+        # draw the calibration target, which also erases the previous one
+        self._erase_time = None
+        self._tar.pos = (xVis, yVis)
+        self._tar.draw()
+        onset = self._display.flip()
+        self.target_onsets.append((x, y, onset))
+
+    def _load_beeps(self):
+        '''Load the beep sounds, keyed by the pylink beep IDs; each beep
+        is a pool of voices, which are played in turn'''
+
+        Sound = _import('psychopy.sound').Sound
+        target_beep, error_beep, done_beep = [
+            collections.deque(Sound(os.path.join(SOUND_DIR, wav), stereo=True)
+                              for _ in range(BEEP_VOICES))
+            for wav in ['type.wav', 'error.wav', 'qbeep.wav']]
+        self._beeps = {pylink.CAL_TARG_BEEP: target_beep,
+                       pylink.DC_TARG_BEEP: target_beep,
+                       pylink.CAL_ERR_BEEP: error_beep,
+                       pylink.DC_ERR_BEEP: error_beep,
+                       pylink.CAL_GOOD_BEEP: done_beep,
+                       pylink.DC_GOOD_BEEP: done_beep}
+
+    def play_beep(self, beepid):
+        ''' Play a sound during calibration/drift-correction.'''
+
+        if self._beeps is None:
+            self._load_beeps()
+        if beepid not in self._beeps:
+            return
+
+        # skip the beep if the previous one of the same kind was played
+        # too recently, e.g., a repeated target beep
+        now = core.getTime()
+        if now - self._last_beep.get(beepid, -float('inf')) < \
+           self._beep_gap:
+            return
+        self._last_beep[beepid] = now
+
+        # play the least recently used voice, stop it first if it is
+        # still playing
+        voices = self._beeps[beepid]
+        voice = voices[0]
+        voices.rotate(-1)
+        if voice.status == _import('psychopy.constants').PLAYING:
+            voice.stop()
+        voice.play()
+
+        if self._beep_wait > 0:
+            core.wait(self._beep_wait)
+
+    def getColorFromIndex(self, colorindex):
+        '''Retrieve the colors for camera image elements, e.g., crosshair'''
+
+        if colorindex == pylink.CR_HAIR_COLOR:
+            return (255, 255, 255)
+        elif colorindex == pylink.PUPIL_HAIR_COLOR:
+            return (255, 255, 255)
+        elif colorindex == pylink.PUPIL_BOX_COLOR:
+            return (0, 255, 0)
+        elif colorindex == pylink.SEARCH_LIMIT_BOX_COLOR:
+            return (255, 0, 0)
+        elif colorindex == pylink.MOUSE_CURSOR_COLOR:
+            return (255, 0, 0)
+        else:
+            return (128, 128, 128)
+
+    def draw_line(self, x1, y1, x2, y2, colorindex):
+        '''Draw a line, see overlay.py'''
+
+        self._overlay.line(x1, y1, x2, y2, self.getColorFromIndex(colorindex))
+
+    def draw_lozenge(self, x, y, width, height, colorindex):
+        ''' draw a lozenge to show the defined search limits '''
+
+        self._overlay.lozenge(x, y, width, height,
+                              self.getColorFromIndex(colorindex))
+
+    def get_mouse_state(self):
+        '''Get the current mouse position and status'''
+
+        t_start = time.perf_counter()
+        w, h = self._win_size
+        X, Y = self._mouse.getPos()
+
+        # scale the mouse position, so the cursor stays on the camera image
+        mX = (X + w/2.0)/w*self._size[0]/2.0
+        mY = (h/2.0 - Y)/h*self._size[1]/2.0
+
+        state = self._mouse.getPressed()[0]
+        self.poll_stats['get_mouse_state'].add(t_start, time.perf_counter())
+
+        return ((mX, mY), state)
+
+    def get_input_key(self):
+        '''This function is repeatedly pooled to check
+        keyboard events'''
+
+        # show a pending erase, if no target has followed
+        if self._erase_time is not None and \
+           core.getTime() - self._erase_time > ERASE_DELAY:
+            self.clear_cal_display()
+
+        t_start = time.perf_counter()
+        ky = []
+        for keycode, modifier in event.getKeys(modifiers=True):
+            k = KEY_TABLE.get(keycode, 0)
+
+            # handles key modifier
+            mod = MOD_MASKS[modifier['alt'] is True, modifier['ctrl'] is True,
+                            modifier['shift'] is True]
+
+            ky.append(pylink.KeyInput(k, mod))
+        self.poll_stats['get_input_key'].add(t_start, time.perf_counter())
+
+        return ky
+
+    def poll_report(self):
+        '''Summarize the calls that the host polls, e.g., print it after
+        tk.doTrackerSetup() to see the CPU time the calibration screen
+        takes'''
+
+        return poll_report(self.poll_stats)
+
+    def exit_image_display(self):
+        '''Clear the camera image'''
+
+        self.clear_cal_display()
+        self._display.flip()
+
+    def alert_printf(self, msg):
+        '''Print error messages.'''
+
+        print("Error: " + msg)
+
+    def setup_image_display(self, width, height):
+        ''' set up the camera image
+
+        return 1 to show high-resolution camera images'''
+
+        self.last_mouse_state = -1
+        self._size = (width, height)
+        self._win_size = tuple(self._display.size)
+        self._overlay.resize(width, height)
+
+        return 1
+
+    def image_title(self, text):
+        '''Draw title text below the camera image'''
+
+        self._title.text = text
+
+    def draw_image_line(self, width, line, totlines, buff):
+        '''Display image line by line; each line of palette indices is
+        copied into the image buffer, and the whole image is mapped to RGB
+        colors with the palette lookup table once it is complete'''
+
+        if self._camera.add_line(width, line, totlines, buff):
+            t_start = time.perf_counter()
+            # look up the colors of all pixels at once
+            rgb = self._camera.colors()
+
+            # draw the cross hairs on the overlay and paste the drawn
+            # pixels onto the camera image
+            self._overlay.resize(width, totlines)
+            self.draw_cross_hair()
+            self._overlay.rasterize()
+            self._overlay.paste(rgb)
+
+            # convert the colors into the texture in place
+            if self._cam_tex is None or self._cam_tex.shape != rgb.shape:
+                self._cam_tex = np.empty(rgb.shape, np.float32)
+            tex = self._cam_tex
+            np.multiply(rgb[::-1], np.float32(2/255.0), out=tex)
+            tex -= 1.0
+
+            # update the texture of the camera image; the image is
+            # enlarged by the graphics card, rather than resized on the CPU
+            size = (width*2, totlines*2)
+            if self._cam_img is None:
+                self._cam_img = visual.ImageStim(self._display, image=tex,
+                                                 size=size, units='pix')
+            else:
+                self._cam_img.image = tex
+                if size != self._cam_size:
+                    self._cam_img.size = size
+            self._cam_size = size
+            self._cam_img.draw()
+            # draw the camera image title
+            self._title.pos = (0, - totlines - self._msgHeight)
+            self._title.draw()
+            self._display.flip()
+            self.poll_stats['camera_frame'].add(t_start, time.perf_counter())
+
+    def set_image_palette(self, r, g, b):
+        '''Given a set of RGB colors, create a lookup table (256 x 3)
+        that maps the palette indices to colors, see camera.py'''
+
+        self._camera.set_palette(r, g, b)
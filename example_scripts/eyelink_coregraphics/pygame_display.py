@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+#
+# Filename: pygame_display.py
+# Author: Zhiguo Wang
+# Date: 10/18/2026
+#
+# Description:
+# An EyeLink coregraphics library (calibration routine)
+# for Pygame experiments, the counterpart of psychopy_display.py.
+#
+# The camera image goes through the same palette lookup table and overlay
+# (see camera.py and overlay.py), then it is copied into a persistent
+# surface with pygame.surfarray and enlarged into another one, so no
+# surface is allocated for each frame.
+
+import os
+import time
+import pylink
+import pygame
+from pygame.locals import *
+from .camera import CameraImage
+from .overlay import CameraOverlay
+from .polling import MOD_MASKS, PollStats, poll_report
+
+# The folder of the beep sounds (type.wav, error.wav, qbeep.wav)
+SOUND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Time (in seconds) an erased target stays on the screen, waiting for the
+# next target to replace it with a single flip
+ERASE_DELAY = 0.1
+
+# Pygame key codes and the corresponding pylink key codes; other ASCII
+# characters are passed as typed, the rest are passed to the tracker as 0
+KEY_TABLE = {K_F1: pylink.F1_KEY, K_F2: pylink.F2_KEY, K_F3: pylink.F3_KEY,
+             K_F4: pylink.F4_KEY, K_F5: pylink.F5_KEY, K_F6: pylink.F6_KEY,
+             K_F7: pylink.F7_KEY, K_F8: pylink.F8_KEY, K_F9: pylink.F9_KEY,
+             K_F10: pylink.F10_KEY,
+             K_PAGEUP: pylink.PAGE_UP, K_PAGEDOWN: pylink.PAGE_DOWN,
+             K_UP: pylink.CURS_UP, K_DOWN: pylink.CURS_DOWN,
+             K_LEFT: pylink.CURS_LEFT, K_RIGHT: pylink.CURS_RIGHT,
+             K_BACKSPACE: ord('\b'), K_RETURN: pylink.ENTER_KEY,
+             K_SPACE: ord(' '), K_ESCAPE: 27, K_TAB: ord('\t'),
+             # plus & minus signs for CR adjustment
+             K_KP_PLUS: ord('+'), K_EQUALS: ord('+'), K_PLUS: ord('+'),
+             K_KP_MINUS: ord('-'), K_MINUS: ord('-')}
+
+
+class EyeLinkCoreGraphicsPygame(pylink.EyeLinkCustomDisplay):
+    def __init__(self, tracker, win=None, beep_wait=0.0, beep_gap=0.0):
+        '''Initialize
+
+        tracker: an EyeLink instance (connection)
+        win: the Pygame display surface we use for calibration, default
+             to pygame.display.get_surface()
+        beep_wait: time to wait (in seconds) after each beep
+        beep_gap: minimum time (in seconds) between two beeps of the same
+                  kind, a beep within this time after the previous one
+                  of its kind is skipped; other kinds are always played'''
+
+        pylink.EyeLinkCustomDisplay.__init__(self)
+
+        # background and target color
+        self._backgroundColor = (128, 128, 128)
+        self._foregroundColor = (0, 0, 0)
+
+        # window to use for calibration
+        self._display = win or pygame.display.get_surface()
+        # make the mouse cursor invisible
+        pygame.mouse.set_visible(False)
+
+        # display width & height
+        self._w, self._h = self._display.get_size()
+
+        # camera image pixels and palette, and the cross hairs, see
+        # camera.py and overlay.py
+        self._camera = CameraImage()
+        self._overlay = CameraOverlay()
+
+        # the camera image, and the enlarged (2x) image for a clearer
+        # view, persistent surfaces created for each image size
+        self._cam_surf = None
+        self._cam_surf_2x = None
+
+        # initial size of the camera image
+        self._size = (384, 320)
+
+        # initial mouse configuration
+        self.last_mouse_state = -1
+
+        # the number and cost of the calls that the host polls, and of
+        # the camera frames (from the last line to the flip)
+        self.poll_stats = {'get_input_key': PollStats(),
+                           'get_mouse_state': PollStats(),
+                           'camera_frame': PollStats()}
+
+        # camera image title, rendered when the text changes
+        self._font = None
+        self._title = None
+        self._title_text = ''
+
+        # calibration target, a ring (a circle of targetSize, drawn with
+        # a line of targetSize/2) rendered once onto a transparent surface
+        self._targetSize = int(self._w/64.)
+        r_out = int(self._targetSize*0.75)
+        self._tar = pygame.Surface((r_out*2, r_out*2), SRCALPHA)
+        pygame.draw.circle(self._tar, self._foregroundColor, (r_out, r_out),
+                           r_out, r_out - int(self._targetSize/4.))
+
+        # the target positions and the time (see time.perf_counter()) of
+        # the flip that showed them, for measuring the calibration latency
+        self.target_onsets = []
+
+        # the time erase_cal_target() was called, if the erase is not
+        # shown yet, see erase_cal_target()
+        self._erase_time = None
+
+        # calibration sounds (beeps), loaded when the calibration display
+        # is first set up
+        self._beeps = None
+        self._beep_wait = beep_wait
+        self._beep_gap = beep_gap
+        # the time of the last beep of each kind (beep ID)
+        self._last_beep = {}
+
+        # a reference to the tracker connection
+        self._tracker = tracker
+
+    def setup_cal_display(self):
+        '''Set up the calibration display '''
+
+        if self._beeps is None:
+            self._load_beeps()
+        self.clear_cal_display()
+
+    def clear_cal_display(self):
+        '''Clear the calibration display'''
+
+        self._erase_time = None
+        self._display.fill(self._backgroundColor)
+        pygame.display.flip()
+
+    def exit_cal_display(self):
+        '''Exit the calibration/validation routine'''
+
+        self.clear_cal_display()
+
+    def record_abort_hide(self):
+        '''This function is called if aborted'''
+
+        pass
+
+    def erase_cal_target(self):
+        '''Erase the target; the host erases the target right before it
+        draws the next one, so the erase is not shown by itself, the
+        flip in draw_cal_target() shows the next target in place of the
+        previous one. If no target follows within ERASE_DELAY, the erase
+        is shown when the keyboard is polled, see get_input_key()'''
+
+        self._erase_time = time.perf_counter()
+
+    def draw_cal_target(self, x, y):
+        '''Draw the target with a single flip, which also erases the
+        previous target'''
+
+        self._erase_time = None
+        self._display.fill(self._backgroundColor)
+        self._display.blit(self._tar, self._tar.get_rect(center=(x, y)))
+        pygame.display.flip()
+        self.target_onsets.append((x, y, time.perf_counter()))
+
+    def _load_beeps(self):
+        '''Load the beep sounds, keyed by the pylink beep IDs; the mixer
+        plays each sound on a free channel, so the beeps can overlap'''
+
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        target_beep, error_beep, done_beep = [
+            pygame.mixer.Sound(os.path.join(SOUND_DIR, wav))
+            for wav in ['type.wav', 'error.wav', 'qbeep.wav']]
+        self._beeps = {pylink.CAL_TARG_BEEP: target_beep,
+                       pylink.DC_TARG_BEEP: target_beep,
+                       pylink.CAL_ERR_BEEP: error_beep,
+                       pylink.DC_ERR_BEEP: error_beep,
+                       pylink.CAL_GOOD_BEEP: done_beep,
+                       pylink.DC_GOOD_BEEP: done_beep}
+
+    def play_beep(self, beepid):
+        ''' Play a sound during calibration/drift-correction.'''
+
+        if self._beeps is None:
+            self._load_beeps()
+        if beepid not in self._beeps:
+            return
+
+        # skip the beep if the previous one of the same kind was played
+        # too recently, e.g., a repeated target beep
+        now = time.perf_counter()
+        if now - self._last_beep.get(beepid, -float('inf')) < \
+           self._beep_gap:
+            return
+        self._last_beep[beepid] = now
+
+        self._beeps[beepid].play()
+        if self._beep_wait > 0:
+            time.sleep(self._beep_wait)
+
+    def getColorFromIndex(self, colorindex):
+        '''Retrieve the colors for camera image elements, e.g., crosshair'''
+
+        if colorindex == pylink.CR_HAIR_COLOR:
+            return (255, 255, 255)
+        elif colorindex == pylink.PUPIL_HAIR_COLOR:
+            return (255, 255, 255)
+        elif colorindex == pylink.PUPIL_BOX_COLOR:
+            return (0, 255, 0)
+        elif colorindex == pylink.SEARCH_LIMIT_BOX_COLOR:
+            return (255, 0, 0)
+        elif colorindex == pylink.MOUSE_CURSOR_COLOR:
+            return (255, 0, 0)
+        else:
+            return (128, 128, 128)
+
+    def draw_line(self, x1, y1, x2, y2, colorindex):
+        '''Draw a line, see overlay.py'''
+
+        self._overlay.line(x1, y1, x2, y2, self.getColorFromIndex(colorindex))
+
+    def draw_lozenge(self, x, y, width, height, colorindex):
+        ''' draw a lozenge to show the defined search limits '''
+
+        self._overlay.lozenge(x, y, width, height,
+                              self.getColorFromIndex(colorindex))
+
+    def get_mouse_state(self):
+        '''Get the current mouse position and status'''
+
+        t_start = time.perf_counter()
+        X, Y = pygame.mouse.get_pos()
+
+        # scale the mouse position, so the cursor stays on the camera image
+        mX = X/self._w*self._size[0]/2.0
+        mY = Y/self._h*self._size[1]/2.0
+
+        state = pygame.mouse.get_pressed()[0]
+        self.poll_stats['get_mouse_state'].add(t_start, time.perf_counter())
+
+        return ((mX, mY), state)
+
+    def get_input_key(self):
+        '''This function is repeatedly pooled to check
+        keyboard events'''
+
+        # show a pending erase, if no target has followed
+        if self._erase_time is not None and \
+           time.perf_counter() - self._erase_time > ERASE_DELAY:
+            self.clear_cal_display()
+
+        t_start = time.perf_counter()
+        ky = []
+        for ev in pygame.event.get(KEYDOWN):
+            k = KEY_TABLE.get(ev.key)
+            if k is None:
+                k = ord(ev.unicode) if len(ev.unicode) == 1 and \
+                    ord(ev.unicode) < 128 else 0
+
+            # handles key modifier
+            mod = MOD_MASKS[bool(ev.mod & KMOD_ALT), bool(ev.mod & KMOD_CTRL),
+                            bool(ev.mod & KMOD_SHIFT)]
+
+            ky.append(pylink.KeyInput(k, mod))
+        self.poll_stats['get_input_key'].add(t_start, time.perf_counter())
+
+        return ky
+
+    def poll_report(self):
+        '''Summarize the calls that the host polls, e.g., print it after
+        tk.doTrackerSetup() to see the CPU time the calibration screen
+        takes'''
+
+        return poll_report(self.poll_stats)
+
+    def exit_image_display(self):
+        '''Clear the camera image'''
+
+        self.clear_cal_display()
+
+    def alert_printf(self, msg):
+        '''Print error messages.'''
+
+        print("Error: " + msg)
+
+    def setup_image_display(self, width, height):
+        ''' set up the camera image
+
+        return 1 to show high-resolution camera images'''
+
+        self.last_mouse_state = -1
+        self._size = (width, height)
+        self._overlay.resize(width, height)
+
+        return 1
+
+    def image_title(self, text):
+        '''Draw title text below the camera image'''
+
+        if text != self._title_text or self._title is None:
+            if self._font is None:
+                if not pygame.font.get_init():
+                    pygame.font.init()
+                self._font = pygame.font.SysFont('Arial', 24)
+            self._title_text = text
+            self._title = self._font.render(text, True,
+                                            self._foregroundColor)
+
+    def draw_image_line(self, width, line, totlines, buff):
+        '''Display image line by line; each line of palette indices is
+        copied into the image buffer, and the whole image is mapped to RGB
+        colors with the palette lookup table once it is complete'''
+
+        if self._camera.add_line(width, line, totlines, buff):
+            t_start = time.perf_counter()
+            # look up the colors of all pixels at once
+            rgb = self._camera.colors()
+
+            # draw the cross hairs on the overlay and paste the drawn
+            # pixels onto the camera image
+            self._overlay.resize(width, totlines)
+            self.draw_cross_hair()
+            self._overlay.rasterize()
+            self._overlay.paste(rgb)
+
+            # copy the pixels into the persistent surfaces, surfarray
+            # indexes the pixels by (x, y)
+            if self._cam_surf is None or \
+               self._cam_surf.get_size() != (width, totlines):
+                self._cam_surf = pygame.Surface((width, totlines))
+                self._cam_surf_2x = pygame.Surface((width*2, totlines*2))
+            pygame.surfarray.blit_array(self._cam_surf, rgb.swapaxes(0, 1))
+            pygame.transform.scale(self._cam_surf, (width*2, totlines*2),
+                                   self._cam_surf_2x)
+
+            # show the camera image and its title at the center
+            self._display.fill(self._backgroundColor)
+            cam_rect = self._cam_surf_2x.get_rect(
+                center=(self._w/2.0, self._h/2.0))
+            self._display.blit(self._cam_surf_2x, cam_rect)
+            if self._title is not None:
+                self._display.blit(self._title, self._title.get_rect(
+                    midtop=(self._w/2.0, cam_rect.bottom + 10)))
+            pygame.display.flip()
+            self.poll_stats['camera_frame'].add(t_start, time.perf_counter())
+
+    def set_image_palette(self, r, g, b):
+        '''Given a set of RGB colors, create a lookup table (256 x 3)
+        that maps the palette indices to colors, see camera.py'''
+
+        self._camera.set_palette(r, g, b)